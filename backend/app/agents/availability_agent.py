@@ -1,8 +1,8 @@
 from typing import Dict, Any, List
 from datetime import datetime, time, timedelta, timezone
-from zoneinfo import ZoneInfo
 
 from app.tools.calendar_read_tool import calendar_read_tool
+from app.tools.timezone_resolver import zone
 from app.tools.trace import tool_trace
 
 
@@ -10,7 +10,7 @@ WORK_START = time(4, 30)
 WORK_END = time(12, 30)
 BUFFER_MINUTES = 30
 
-IST = ZoneInfo("Asia/Kolkata")
+IST = zone("Asia/Kolkata")
 
 
 class AvailabilityAgent:
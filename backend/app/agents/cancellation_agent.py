@@ -1,5 +1,4 @@
 from typing import Dict, Any
-from zoneinfo import ZoneInfo
 
 from app.db.session import SessionLocal
 from app.db.models import Interview, Candidate
@@ -7,7 +6,12 @@ from app.db.models import Interview, Candidate
 from app.tools.calendar_delete_tool import calendar_delete_tool
 from app.tools.notification_tool import notification_tool
 from app.tools.trace import tool_trace
-from app.tools.memory_tool import save_state
+from app.tools.trace_store import record_tool_trace
+from app.tools.memory_tool import memory_for
+from app.tools.timezone_resolver import zone
+
+
+IST = zone("Asia/Kolkata")
 
 
 class CancellationAgent:
@@ -17,7 +21,7 @@ class CancellationAgent:
     def run(self, state: Dict[str, Any]) -> Dict[str, Any]:
 
         data = state.get("conversation_state") or {}
-        data.setdefault("tool_traces", [])
+        data.pop("tool_traces", None)
 
         conversation_id = state.get("conversation_id")
 
@@ -65,9 +69,7 @@ class CancellationAgent:
                 if not it.scheduled_time:
                     continue
 
-                ist_time = it.scheduled_time.astimezone(
-                    ZoneInfo("Asia/Kolkata")
-                ).strftime("%d/%m/%Y, %I:%M %p")
+                ist_time = it.scheduled_time.astimezone(IST).strftime("%d/%m/%Y, %I:%M %p")
 
                 lines.append(f"{i}. {ist_time} with Default Interviewer")
                 ids.append(it.id)
@@ -75,7 +77,7 @@ class CancellationAgent:
             data["cancel_candidates"] = ids
 
             if conversation_id:
-                save_state(conversation_id, data)
+                memory_for(state).save(data)
 
             return {
                 "agent": self.name,
@@ -122,7 +124,7 @@ class CancellationAgent:
         tool_trace(state, "calendar_delete_tool", delete_input, delete_result)
 
         if delete_result.get("trace"):
-            data["tool_traces"].append(delete_result["trace"])
+            record_tool_trace(data, conversation_id, delete_result["trace"])
 
         if not delete_result.get("success"):
             return {
@@ -144,7 +146,7 @@ class CancellationAgent:
         tool_trace(state, "notification_tool", notify_input, notify_result)
 
         if notify_result.get("trace"):
-            data["tool_traces"].append(notify_result["trace"])
+            record_tool_trace(data, conversation_id, notify_result["trace"])
 
         db = SessionLocal()
         try:
@@ -166,7 +168,7 @@ class CancellationAgent:
         data.pop("cancel_candidates", None)
 
         if conversation_id:
-            save_state(conversation_id, data)
+            memory_for(state).save(data)
 
         return {
             "agent": self.name,
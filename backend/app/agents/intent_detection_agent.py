@@ -1,10 +1,100 @@
-from typing import Dict, Any
+from typing import Dict, Any, List
+import asyncio
 import json
-from groq import Groq
+import os
+import re
 from app.config import GROQ_API_KEY
+from app.tools.intent_classifier import LocalIntentClassifier
+from app.tools.llm_client import get_llm_client
+from app.tools.llm_guard import guard_for
+from app.tools.lru_cache import TTLCache
+from app.tools.metrics import Counters
+from app.tools.micro_batcher import MicroBatcher
+from app.tools.model_router import create_completion, route_for
 
 ALLOWED_INTENTS = {"schedule", "reschedule", "cancel", "inquiry"}
 
+# Local classifications at or above this confidence skip the LLM call.
+LOCAL_CONFIDENCE_THRESHOLD = float(os.getenv("INTENT_LOCAL_THRESHOLD", "0.8"))
+
+# Both shortcuts can be switched off, e.g. so a benchmark measures the
+# LLM path on every first turn.
+LOCAL_ENABLED = os.getenv("INTENT_LOCAL_ENABLED", "true").lower() in ("1", "true", "yes")
+CACHE_ENABLED = os.getenv("INTENT_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+
+CACHE_SIZE = int(os.getenv("INTENT_CACHE_SIZE", "2048"))
+CACHE_TTL_SECONDS = float(os.getenv("INTENT_CACHE_TTL_SECONDS", "3600"))
+
+# When enabled, the intent call also extracts every booking slot it can
+# find, so a user who writes one complete sentence is booked in one turn.
+EXTRACTION_MODE = os.getenv("INTENT_EXTRACTION_MODE", "false").lower() in ("1", "true", "yes")
+
+# Optional micro-batching: intent-only LLM calls that arrive within the
+# window are classified together in one prompt.
+BATCH_ENABLED = os.getenv("INTENT_BATCH_ENABLED", "false").lower() in ("1", "true", "yes")
+BATCH_WINDOW_MS = float(os.getenv("INTENT_BATCH_WINDOW_MS", "20"))
+BATCH_MAX_SIZE = int(os.getenv("INTENT_BATCH_MAX_SIZE", "16"))
+
+SLOT_FIELDS = (
+    "candidate_name",
+    "candidate_email",
+    "preferred_datetime",
+    "timezone",
+)
+
+_NON_WORD = re.compile(r"\W+")
+_EMAIL = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+_SLOT_CUES = re.compile(r"[0-9@/]")
+
+
+def normalize_message(user_message: str) -> str:
+    """Cache key: case-folded, punctuation and whitespace collapsed."""
+    return " ".join(_NON_WORD.sub(" ", user_message.casefold()).split())
+
+
+def _has_slot_cues(user_message: str) -> bool:
+    """Digits, an @ or an Area/City slash, or simply a long sentence."""
+    return bool(_SLOT_CUES.search(user_message)) or len(user_message.split()) > 6
+
+
+def _confidence(data: Dict[str, Any]) -> float:
+    """Confidence of a raw LLM answer; 0 when the label is not allowed."""
+
+    if str(data.get("intent", "")).lower().strip() not in ALLOWED_INTENTS:
+        return 0.0
+
+    try:
+        return float(data.get("confidence", 0.0))
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _clean_slots(raw: Any) -> Dict[str, str]:
+
+    if not isinstance(raw, dict):
+        return {}
+
+    slots = {}
+
+    for field in SLOT_FIELDS:
+        value = raw.get(field)
+
+        if value is None or isinstance(value, (dict, list, bool)):
+            continue
+
+        value = str(value).strip()
+
+        if not value or value.lower() in ("null", "none", "unknown"):
+            continue
+
+        if field == "candidate_email" and not _EMAIL.fullmatch(value):
+            continue
+
+        slots[field] = value
+
+    return slots
+
+
 class IntentDetectionAgent:
 
     name = "IntentDetectionAgent"
@@ -13,9 +103,32 @@ class IntentDetectionAgent:
         if not GROQ_API_KEY:
             raise RuntimeError("GROQ_API_KEY is missing")
 
-        self.client = Groq(api_key=GROQ_API_KEY)
+        self.client = get_llm_client()
+        self.local_classifier = LocalIntentClassifier()
+        self.counters = Counters(
+            "requests", "local_hits", "cache_hits", "llm_calls",
+            "batches", "batch_fallbacks", "escalations", "extract_fallbacks",
+        )
+        self.cache = TTLCache(max_size=CACHE_SIZE, ttl_seconds=CACHE_TTL_SECONDS)
+        self.guard = guard_for("intent")
+        self.route = route_for("intent")
+        self.extract_route = route_for("intent_extract")
+        self.batcher = MicroBatcher(
+            self._classify_batch,
+            max_batch=BATCH_MAX_SIZE,
+            max_wait_seconds=BATCH_WINDOW_MS / 1000,
+        ) if BATCH_ENABLED else None
+
+    def stats(self) -> Dict[str, Any]:
+        counts = self.counters.snapshot()
+        requests = counts["requests"]
+        counts["local_hit_rate"] = (counts["local_hits"] / requests) if requests else 0.0
+        counts["cache"] = self.cache.stats()
+        if self.batcher is not None:
+            counts["batching"] = self.batcher.stats()
+        return counts
 
-    def run(self, state: Dict[str, Any]) -> Dict[str, Any]:
+    async def run(self, state: Dict[str, Any]) -> Dict[str, Any]:
 
         user_message = (state.get("user_message") or "").strip()
 
@@ -26,37 +139,49 @@ class IntentDetectionAgent:
                 "confidence": 1.0
             }
 
-        prompt = (
-            "You are an interview scheduling assistant.\n\n"
-            "Classify the user's intent and return a JSON object only.\n\n"
-            "Allowed intents:\n"
-            "schedule, reschedule, cancel, inquiry\n\n"
-            "Rules:\n"
-            "- booking or creating an interview means schedule\n"
-            "- changing an existing interview means reschedule\n"
-            "- deleting or cancelling an interview means cancel\n"
-            "- general questions or chat mean inquiry\n\n"
-            "Return strictly in this format:\n"
-            "{ \"intent\": \"<intent>\", \"confidence\": <number between 0 and 1> }\n\n"
-            f"User message:\n{user_message}"
-        )
+        self.counters.inc("requests")
 
-        try:
-            response = self.client.chat.completions.create(
-                model="llama-3.3-70b-versatile",
-                messages=[
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0,
-                max_tokens=150,
-            )
+        # In extraction mode a message that probably carries slots goes to
+        # the LLM even when its intent is obvious. The local answer is still
+        # worked out, to fall back on if that call fails.
+        extract = EXTRACTION_MODE and _has_slot_cues(user_message)
 
-            content = response.choices[0].message.content.strip()
+        local = self.local_classifier.classify(user_message) if LOCAL_ENABLED else None
+        confident = local is not None and local["confidence"] >= LOCAL_CONFIDENCE_THRESHOLD
 
-            # Extra safety for Llama JSON reliability
-            content = content.replace("```json", "").replace("```", "").strip()
+        if confident and not extract:
+            self.counters.inc("local_hits")
+            return {
+                "agent": self.name,
+                "intent": local["intent"],
+                "confidence": local["confidence"],
+                "source": "local"
+            }
+
+        cache_key = normalize_message(user_message)
+        cached = self.cache.get(cache_key) if CACHE_ENABLED and not extract else None
+
+        if cached is not None:
+            self.counters.inc("cache_hits")
+            return {
+                "agent": self.name,
+                "intent": cached["intent"],
+                "confidence": cached["confidence"],
+                "source": "cache"
+            }
 
-            data = json.loads(content)
+        self.counters.inc("llm_calls")
+
+        try:
+            if self.batcher is not None and not extract:
+                data = await self.batcher.submit(user_message)
+            else:
+                data = await self._classify_one(user_message, extract)
+
+            # The small model was unsure: ask the large one.
+            if not extract and self.route.should_escalate(_confidence(data)):
+                self.counters.inc("escalations")
+                data = await self._classify_one(user_message, model=self.route.escalate_to)
 
             intent = str(data.get("intent", "")).lower().strip()
             confidence = float(data.get("confidence", 0.0))
@@ -67,15 +192,189 @@ class IntentDetectionAgent:
             if confidence < 0.60:
                 intent = "unknown"
 
-            return {
+            slots = _clean_slots(data.get("slots")) if extract else {}
+
+            # Slots are specific to the exact wording, so only slot-free
+            # results are shared through the normalized-message cache.
+            if CACHE_ENABLED and not slots:
+                self.cache.set(cache_key, {"intent": intent, "confidence": confidence})
+
+            result = {
                 "agent": self.name,
                 "intent": intent,
-                "confidence": confidence
+                "confidence": confidence,
+                "source": "llm"
             }
 
+            if slots:
+                result["llm_fields"] = slots
+
+            return result
+
         except Exception:
+            if extract and confident:
+                self.counters.inc("extract_fallbacks")
+                return {
+                    "agent": self.name,
+                    "intent": local["intent"],
+                    "confidence": local["confidence"],
+                    "source": "local"
+                }
+
             return {
                 "agent": self.name,
                 "intent": "unknown",
-                "confidence": 0.0
-            }
\ No newline at end of file
+                "confidence": 0.0,
+                "source": "llm"
+            }
+
+    async def _classify_one(
+        self,
+        user_message: str,
+        extract: bool = False,
+        model: str = None
+    ) -> Dict[str, Any]:
+
+        if extract:
+            response = await self.guard.call(
+                lambda: create_completion(
+                    self.client,
+                    model or self.extract_route.model,
+                    f"{self.name}.extract",
+                    messages=[
+                        {"role": "user", "content": self._extraction_prompt(user_message)}
+                    ],
+                    temperature=0,
+                    max_tokens=300,
+                    response_format={"type": "json_object"},
+                )
+            )
+        else:
+            # An explicit model means this is the escalation retry.
+            site = f"{self.name}.escalation" if model else f"{self.name}.intent"
+
+            response = await self.guard.call(
+                lambda: create_completion(
+                    self.client,
+                    model or self.route.model,
+                    site,
+                    messages=[
+                        {"role": "user", "content": self._prompt(user_message)}
+                    ],
+                    temperature=0,
+                    max_tokens=150,
+                )
+            )
+
+        content = response.choices[0].message.content.strip()
+
+        # Extra safety for Llama JSON reliability
+        content = content.replace("```json", "").replace("```", "").strip()
+
+        return json.loads(content)
+
+    async def _classify_batch(self, messages: List[str]) -> List[Any]:
+        """
+        One prompt for the whole batch. If the reply cannot be matched up
+        with the messages, each message is classified on its own instead.
+        """
+
+        if len(messages) == 1:
+            return [await self._classify_one(messages[0])]
+
+        self.counters.inc("batches")
+
+        try:
+            response = await self.guard.call(
+                lambda: create_completion(
+                    self.client,
+                    self.route.model,
+                    f"{self.name}.batch",
+                    messages=[
+                        {"role": "user", "content": self._batch_prompt(messages)}
+                    ],
+                    temperature=0,
+                    max_tokens=40 * len(messages) + 50,
+                    response_format={"type": "json_object"},
+                )
+            )
+
+            content = response.choices[0].message.content.strip()
+            content = content.replace("```json", "").replace("```", "").strip()
+
+            results = json.loads(content)["results"]
+
+            by_index = {int(item["index"]): item for item in results}
+
+            return [by_index[i] for i in range(1, len(messages) + 1)]
+
+        except Exception:
+            self.counters.inc("batch_fallbacks")
+
+        outcomes = await asyncio.gather(
+            *(self._classify_one(m) for m in messages),
+            return_exceptions=True
+        )
+
+        # A per-message failure is raised to that caller alone.
+        return list(outcomes)
+
+    def _prompt(self, user_message: str) -> str:
+        return (
+            "You are an interview scheduling assistant.\n\n"
+            "Classify the user's intent and return a JSON object only.\n\n"
+            "Allowed intents:\n"
+            "schedule, reschedule, cancel, inquiry\n\n"
+            "Rules:\n"
+            "- booking or creating an interview means schedule\n"
+            "- changing an existing interview means reschedule\n"
+            "- deleting or cancelling an interview means cancel\n"
+            "- general questions or chat mean inquiry\n\n"
+            "Return strictly in this format:\n"
+            "{ \"intent\": \"<intent>\", \"confidence\": <number between 0 and 1> }\n\n"
+            f"User message:\n{user_message}"
+        )
+
+    def _batch_prompt(self, messages: List[str]) -> str:
+        numbered = "\n".join(
+            f"{i}. {json.dumps(m)}" for i, m in enumerate(messages, 1)
+        )
+        return (
+            "You are an interview scheduling assistant.\n\n"
+            "Classify the intent of each numbered user message independently "
+            "and return a JSON object only.\n\n"
+            "Allowed intents:\n"
+            "schedule, reschedule, cancel, inquiry\n\n"
+            "Rules:\n"
+            "- booking or creating an interview means schedule\n"
+            "- changing an existing interview means reschedule\n"
+            "- deleting or cancelling an interview means cancel\n"
+            "- general questions or chat mean inquiry\n"
+            "- return exactly one result per message, using its number as index\n\n"
+            "Return strictly in this format:\n"
+            "{ \"results\": [ { \"index\": <number>, \"intent\": \"<intent>\", "
+            "\"confidence\": <number between 0 and 1> } ] }\n\n"
+            f"User messages:\n{numbered}"
+        )
+
+    def _extraction_prompt(self, user_message: str) -> str:
+        return (
+            "You are an interview scheduling assistant.\n\n"
+            "Classify the user's intent and extract every booking detail the "
+            "message contains. Return a JSON object only.\n\n"
+            "Allowed intents:\n"
+            "schedule, reschedule, cancel, inquiry\n\n"
+            "Rules:\n"
+            "- booking or creating an interview means schedule\n"
+            "- changing an existing interview means reschedule\n"
+            "- deleting or cancelling an interview means cancel\n"
+            "- general questions or chat mean inquiry\n"
+            "- copy values exactly as the user wrote them; use null for anything not stated\n"
+            "- preferred_datetime is the date and time only, without the timezone\n"
+            "- timezone is an IANA name such as Asia/Kolkata, or the abbreviation the user gave\n\n"
+            "Return strictly in this format:\n"
+            "{ \"intent\": \"<intent>\", \"confidence\": <number between 0 and 1>, "
+            "\"slots\": { \"candidate_name\": <string or null>, \"candidate_email\": <string or null>, "
+            "\"preferred_datetime\": <string or null>, \"timezone\": <string or null> } }\n\n"
+            f"User message:\n{user_message}"
+        )
@@ -1,6 +1,5 @@
 from typing import Dict, Any
 from datetime import datetime
-from zoneinfo import ZoneInfo
 
 from app.db.session import SessionLocal
 from app.db.models import Interview, Candidate
@@ -8,8 +7,13 @@ from app.db.models import Interview, Candidate
 from app.tools.calendar_update_tool import calendar_update_tool
 from app.tools.notification_tool import notification_tool
 from app.tools.trace import tool_trace
-from app.tools.timezone_tool import timezone_normalize_tool
-from app.tools.memory_tool import save_state
+from app.tools.trace_store import record_tool_trace
+from app.tools.timezone_tool import timezone_normalize_tool, timezone_retry_reply
+from app.tools.memory_tool import memory_for
+from app.tools.timezone_resolver import zone
+
+
+IST = zone("Asia/Kolkata")
 
 
 class RescheduleAgent:
@@ -19,7 +23,7 @@ class RescheduleAgent:
     def run(self, state: Dict[str, Any]) -> Dict[str, Any]:
 
         data = state.get("conversation_state") or {}
-        data.setdefault("tool_traces", [])
+        data.pop("tool_traces", None)
 
         conversation_id = state.get("conversation_id")
 
@@ -71,9 +75,7 @@ class RescheduleAgent:
                 if not it.scheduled_time:
                     continue
 
-                ist_time = it.scheduled_time.astimezone(
-                    ZoneInfo("Asia/Kolkata")
-                ).strftime("%d/%m/%Y, %I:%M %p")
+                ist_time = it.scheduled_time.astimezone(IST).strftime("%d/%m/%Y, %I:%M %p")
 
                 lines.append(f"{i}. {ist_time} with Default Interviewer")
                 ids.append(it.id)
@@ -81,7 +83,7 @@ class RescheduleAgent:
             data["reschedule_candidates"] = ids
 
             if conversation_id:
-                save_state(conversation_id, data)
+                memory_for(state).save(data)
 
             return {
                 "agent": self.name,
@@ -100,7 +102,7 @@ class RescheduleAgent:
                 data["awaiting_field"] = "new_preferred_datetime"
 
                 if conversation_id:
-                    save_state(conversation_id, data)
+                    memory_for(state).save(data)
 
                 return {
                     "agent": self.name,
@@ -113,7 +115,7 @@ class RescheduleAgent:
                 data["awaiting_field"] = "new_timezone"
 
                 if conversation_id:
-                    save_state(conversation_id, data)
+                    memory_for(state).save(data)
 
                 return {
                     "agent": self.name,
@@ -135,12 +137,18 @@ class RescheduleAgent:
                 data.pop("new_timezone", None)
                 data["awaiting_field"] = "new_timezone"
 
+                reply = timezone_retry_reply(
+                    data,
+                    tz_result,
+                    "I could not understand the timezone. Please enter it again (for example: Asia/Kolkata)."
+                )
+
                 if conversation_id:
-                    save_state(conversation_id, data)
+                    memory_for(state).save(data)
 
                 return {
                     "agent": self.name,
-                    "reply": "I could not understand the timezone. Please enter it again (for example: Asia/Kolkata).",
+                    "reply": reply,
                     "is_complete": False,
                     "conversation_state": data
                 }
@@ -181,7 +189,7 @@ class RescheduleAgent:
         tool_trace(state, "calendar_update_tool", update_input, update_result)
 
         if update_result.get("trace"):
-            data["tool_traces"].append(update_result["trace"])
+            record_tool_trace(data, conversation_id, update_result["trace"])
 
         if not update_result.get("success"):
             return {
@@ -203,7 +211,7 @@ class RescheduleAgent:
         tool_trace(state, "notification_tool", notify_input, notify_result)
 
         if notify_result.get("trace"):
-            data["tool_traces"].append(notify_result["trace"])
+            record_tool_trace(data, conversation_id, notify_result["trace"])
 
         if not notify_result.get("success"):
             return {
@@ -238,7 +246,7 @@ class RescheduleAgent:
         data.pop("interview_id", None)
 
         if conversation_id:
-            save_state(conversation_id, data)
+            memory_for(state).save(data)
 
         return {
             "agent": self.name,
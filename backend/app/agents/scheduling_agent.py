@@ -5,7 +5,7 @@ from app.db.models import Interview, Candidate, Interviewer
 from app.tools.calendar_create_tool import calendar_create_tool
 from app.tools.notification_tool import notification_tool
 from app.tools.trace import tool_trace
-from app.tools.memory_tool import save_state
+from app.tools.memory_tool import memory_for
 
 
 class SchedulingAgent:
@@ -157,12 +157,13 @@ class SchedulingAgent:
         data.pop("preferred_datetime_utc", None)
         data.pop("selected_time_utc", None)
         data.pop("timezone", None)
+        data.pop("interview_choice", None)
         data.pop("awaiting_field", None)
         data.pop("reason", None)
         data.pop("intent", None)
 
         if conversation_id:
-            save_state(conversation_id, data)
+            memory_for(state).save(data)
 
         return {
             "agent": self.name,
@@ -0,0 +1,29 @@
+from fastapi import APIRouter
+
+from app.graph.interview_graph import intent_agent
+from app.tools.datetime_parser import parser_stats
+from app.tools.llm_accounting import RECENT_CALLS, recent_calls, site_stats
+from app.tools.llm_guard import guard_stats
+from app.tools.memory_tool import cache_stats
+from app.tools.model_router import model_stats
+from app.tools.timezone_resolver import resolver_stats
+
+router = APIRouter()
+
+
+@router.get("/metrics")
+def get_metrics():
+    return {
+        "memory_cache": cache_stats(),
+        "intent": intent_agent.stats(),
+        "llm": guard_stats(),
+        "models": model_stats(),
+        "llm_calls": site_stats(),
+        "datetime_parser": parser_stats(),
+        "timezones": resolver_stats()
+    }
+
+
+@router.get("/metrics/llm/calls")
+def get_recent_llm_calls(limit: int = 50):
+    return recent_calls(max(1, min(limit, RECENT_CALLS)))
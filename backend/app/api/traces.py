@@ -0,0 +1,10 @@
+from fastapi import APIRouter
+
+from app.tools.trace_store import list_tool_traces
+
+router = APIRouter()
+
+
+@router.get("/conversations/{conversation_id}/traces")
+def get_conversation_traces(conversation_id: str, limit: int = 100):
+    return list_tool_traces(conversation_id, limit=max(1, min(limit, 1000)))
@@ -5,5 +5,9 @@ load_dotenv()
 
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 
+# Point the LLM clients somewhere other than api.groq.com, e.g. the local
+# stand-in in benchmarks/groq_standin.py. Unset means the SDK default.
+GROQ_BASE_URL = os.getenv("GROQ_BASE_URL") or None
+
 if not GROQ_API_KEY:
     raise RuntimeError("GROQ_API_KEY is missing")
\ No newline at end of file
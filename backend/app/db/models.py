@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -36,3 +36,17 @@ class Interview(Base):
 
     candidate = relationship("Candidate")
     interviewer = relationship("Interviewer")
+
+
+class ToolTraceRecord(Base):
+    __tablename__ = "tool_traces"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    conversation_id = Column(String, index=True, nullable=False)
+    trace_id = Column(String, index=True, nullable=False)
+    tool_name = Column(String, nullable=True)
+    status = Column(String, nullable=True)
+    trace_json = Column(Text, nullable=False)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
@@ -1,4 +1,5 @@
-from typing import TypedDict, Dict, Any
+import asyncio
+from typing import TypedDict, Dict, Any, Optional
 from langgraph.graph import StateGraph, END
 
 from app.agents.intent_detection_agent import IntentDetectionAgent
@@ -9,7 +10,8 @@ from app.agents.reschedule_agent import RescheduleAgent
 from app.agents.cancellation_agent import CancellationAgent
 
 from app.tools.trace import agent_trace
-from app.tools.memory_tool import load_state
+from app.tools.memory_tool import ConversationMemory, memory_for, peek_state
+from app.tools.slot_extractor import SlotExtraction, extract_slots
 
 
 class InterviewState(TypedDict, total=False):
@@ -27,6 +29,10 @@ class InterviewState(TypedDict, total=False):
     new_time_utc: str
     success: bool
     trace: list
+    memory: ConversationMemory
+    events: Optional[asyncio.Queue]
+    extracted_fields: Dict[str, str]
+    slots: SlotExtraction
 
 
 intent_agent = IntentDetectionAgent()
@@ -37,60 +43,136 @@ reschedule_agent = RescheduleAgent()
 cancellation_agent = CancellationAgent()
 
 
-def intent_node(state: InterviewState) -> InterviewState:
+# Nodes are coroutines so a whole turn can be awaited with graph.ainvoke.
+# LLM calls are native async; the synchronous agents and the SQLite/
+# SQLAlchemy access inside them run on worker threads so they never block
+# the event loop.
+
+
+def emit_event(state: InterviewState, event: str, data: Dict[str, Any]) -> None:
+    """Push a progress event to the turn's stream, if one is attached."""
+    events = state.get("events")
+    if events is not None:
+        events.put_nowait((event, data))
+
+
+def _emit_new_tool_traces(state: InterviewState, start: int) -> None:
+    for entry in (state.get("trace") or [])[start:]:
+        if entry.get("type") == "tool":
+            emit_event(state, "tool", {
+                "name": entry.get("name"),
+                "input": entry.get("input"),
+                "output": entry.get("output"),
+            })
+
+
+async def intent_node(state: InterviewState) -> InterviewState:
+    """
+    Entry node. The stored-state read runs on a worker thread while the
+    intent call and the field extraction run alongside it, so the node
+    takes max(load, LLM) rather than their sum.
+
+    An answer to a question keeps the stored intent, so the intent call is
+    not started when the cached copy of the state shows a field is being
+    awaited, and is cancelled if the load turns out to show one.
+    """
+
+    emit_event(state, "node", {"node": "intent", "status": "started"})
 
     state.pop("reason", None)
 
     conversation_id = state.get("conversation_id")
 
-    stored = {}
+    load_task = None
+    cached = None
     if conversation_id:
-        stored = load_state(conversation_id) or {}
+        load_task = asyncio.create_task(asyncio.to_thread(memory_for(state).load))
+        cached = peek_state(conversation_id)
+
+    intent_task = None
+    if not (cached or {}).get("awaiting_field"):
+        intent_task = asyncio.create_task(intent_agent.run(state))
+
+    # The one scan of the message this turn; ConversationAgent reuses it.
+    state["slots"] = extract_slots(state.get("user_message"))
+    state["extracted_fields"] = state["slots"].fields()
+
+    stored = {}
+    if load_task is not None:
+        try:
+            stored = await load_task or {}
+        except BaseException:
+            if intent_task is not None:
+                intent_task.cancel()
+            raise
 
     if stored.get("awaiting_field"):
+        if intent_task is not None:
+            intent_task.cancel()
         if stored.get("intent"):
             state["intent"] = stored["intent"]
+        emit_event(state, "node", {"node": "intent", "status": "finished", "intent": state.get("intent")})
         return state
 
-    result = intent_agent.run(state)
+    # The cached copy was stale: the field has been answered since.
+    if intent_task is None:
+        intent_task = asyncio.create_task(intent_agent.run(state))
+
+    result = await intent_task
     agent_trace(state, "IntentDetectionAgent", result)
     state.update(result)
 
-    return state
+    # Slots from the structured LLM call take precedence over the regex
+    # heuristics (which only see comma-separated datetimes and "my name
+    # is" phrasing); they are validated again downstream either way.
+    llm_fields = result.get("llm_fields")
+    if llm_fields:
+        state["extracted_fields"] = {**state["extracted_fields"], **llm_fields}
 
+    emit_event(state, "node", {"node": "intent", "status": "finished", "intent": state.get("intent")})
 
-def conversation_node(state: InterviewState) -> InterviewState:
-    result = conversation_agent.run(state)
-    agent_trace(state, "ConversationAgent", result)
-    state.update(result)
     return state
 
 
-def availability_node(state: InterviewState) -> InterviewState:
-    result = availability_agent.run(state)
-    agent_trace(state, "AvailabilityAgent", result)
-    state.update(result)
-    return state
+async def _run_sync_agent(node: str, agent, state: InterviewState) -> InterviewState:
 
+    emit_event(state, "node", {"node": node, "status": "started"})
+    trace_start = len(state.get("trace") or [])
 
-def scheduling_node(state: InterviewState) -> InterviewState:
-    result = scheduling_agent.run(state)
-    agent_trace(state, "SchedulingAgent", result)
+    result = await asyncio.to_thread(agent.run, state)
+    agent_trace(state, agent.name, result)
     state.update(result)
-    return state
 
+    _emit_new_tool_traces(state, trace_start)
+    emit_event(state, "node", {"node": node, "status": "finished", "reply": result.get("reply")})
 
-def reschedule_node(state: InterviewState) -> InterviewState:
-    result = reschedule_agent.run(state)
-    agent_trace(state, "RescheduleAgent", result)
-    state.update(result)
     return state
 
 
-def cancellation_node(state: InterviewState) -> InterviewState:
-    result = cancellation_agent.run(state)
-    agent_trace(state, "CancellationAgent", result)
-    state.update(result)
+async def conversation_node(state: InterviewState) -> InterviewState:
+    return await _run_sync_agent("conversation", conversation_agent, state)
+
+
+async def availability_node(state: InterviewState) -> InterviewState:
+    return await _run_sync_agent("availability", availability_agent, state)
+
+
+async def scheduling_node(state: InterviewState) -> InterviewState:
+    return await _run_sync_agent("scheduling", scheduling_agent, state)
+
+
+async def reschedule_node(state: InterviewState) -> InterviewState:
+    return await _run_sync_agent("reschedule", reschedule_agent, state)
+
+
+async def cancellation_node(state: InterviewState) -> InterviewState:
+    return await _run_sync_agent("cancel", cancellation_agent, state)
+
+
+async def persist_node(state: InterviewState) -> InterviewState:
+    memory = state.get("memory")
+    if memory is not None:
+        await asyncio.to_thread(memory.flush)
     return state
 
 
@@ -150,6 +232,7 @@ def build_graph():
     graph.add_node("scheduling", scheduling_node)
     graph.add_node("reschedule", reschedule_node)
     graph.add_node("cancel", cancellation_node)
+    graph.add_node("persist", persist_node)
 
     graph.set_entry_point("intent")
 
@@ -169,7 +252,7 @@ def build_graph():
             "reschedule": "reschedule",
             "cancel": "cancel",
             "conversation": "conversation",
-            END: END,
+            END: "persist",
         },
     )
 
@@ -182,8 +265,9 @@ def build_graph():
         },
     )
 
-    graph.add_edge("scheduling", END)
-    graph.add_edge("reschedule", END)
-    graph.add_edge("cancel", END)
+    graph.add_edge("scheduling", "persist")
+    graph.add_edge("reschedule", "persist")
+    graph.add_edge("cancel", "persist")
+    graph.add_edge("persist", END)
 
     return graph.compile()
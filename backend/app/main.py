@@ -1,19 +1,40 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Set
 import uuid
 import os
+import json
+import asyncio
 from dotenv import load_dotenv
 from app.db.database import engine
 from app.db import models
 from app.graph.interview_graph import build_graph
 from app.api.interviews import router as interview_router
+from app.api.metrics import router as metrics_router
+from app.api.traces import router as traces_router
+from app.tools.llm_client import close_llm_clients, warm_llm_clients
+from app.tools.memory_tool import (
+    close_connections,
+    conversation_lock,
+    start_sweeper,
+    stop_sweeper,
+)
 
 load_dotenv()
 
 FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:5173")
 
+# How often a turn is replayed after losing a state version race.
+STATE_CONFLICT_RETRIES = int(os.getenv("MEMORY_CONFLICT_RETRIES", "2"))
+
+# Open LLM keep-alive connections before the first request needs them.
+LLM_WARM_ON_STARTUP = os.getenv("LLM_WARM_ON_STARTUP", "true").lower() in ("1", "true", "yes")
+
+# Agents whose side effects (calendar, email) must never run twice.
+SIDE_EFFECT_AGENTS = {"SchedulingAgent", "RescheduleAgent", "CancellationAgent"}
+
 models.Base.metadata.create_all(bind=engine)
 
 app = FastAPI(title="AI Interview Scheduler")
@@ -27,9 +48,39 @@ app.add_middleware(
 )
 
 app.include_router(interview_router)
+app.include_router(metrics_router)
+app.include_router(traces_router)
 
 graph = build_graph()
 
+
+@app.on_event("startup")
+def start_memory_sweeper():
+    start_sweeper()
+
+
+@app.on_event("startup")
+async def warm_llm_connections():
+    if LLM_WARM_ON_STARTUP:
+        await warm_llm_clients()
+
+
+@app.on_event("shutdown")
+def close_memory_connections():
+    stop_sweeper()
+    close_connections()
+
+
+@app.on_event("shutdown")
+async def close_llm_connections():
+    await close_llm_clients()
+
+
+# Streamed turns keep running after their client disconnects; held here so
+# the event loop keeps a reference until they finish.
+_detached_turns: Set[asyncio.Task] = set()
+
+
 class ChatRequest(BaseModel):
     user_message: str
     conversation_id: Optional[str] = None
@@ -39,17 +90,52 @@ def health_check():
     return {"status": "running"}
 
 
-@app.post("/chat")
-def chat(req: ChatRequest) -> Dict[str, Any]:
+class _AttemptEvents:
+    """Passes one attempt's events on, tagged with the attempt number."""
 
-    conversation_id = req.conversation_id or str(uuid.uuid4())
+    def __init__(self, events: asyncio.Queue, attempt: int):
+        self.events = events
+        self.attempt = attempt
 
-    initial_state = {
-        "conversation_id": conversation_id,
-        "user_message": req.user_message
-    }
+    def put_nowait(self, item) -> None:
+        event, data = item
+        self.events.put_nowait((event, {**data, "attempt": self.attempt}))
+
+
+async def _run_turn(
+    conversation_id: str,
+    user_message: str,
+    events: Optional[asyncio.Queue] = None
+) -> Dict[str, Any]:
+
+    async with conversation_lock(conversation_id):
+
+        for attempt in range(1, STATE_CONFLICT_RETRIES + 2):
+
+            if events is not None and attempt > 1:
+                events.put_nowait(("retry", {"attempt": attempt, "reason": "state_conflict"}))
 
-    result = graph.invoke(initial_state) or {}
+            result = await graph.ainvoke({
+                "conversation_id": conversation_id,
+                "user_message": user_message,
+                "events": _AttemptEvents(events, attempt) if events is not None else None
+            }) or {}
+
+            memory = result.get("memory")
+
+            if memory is None or not memory.conflict:
+                return result
+
+            agents = {t.get("name") for t in result.get("trace") or []}
+
+            if agents & SIDE_EFFECT_AGENTS:
+                break
+
+        result["reason"] = "state_conflict"
+        return result
+
+
+def _build_response(conversation_id: str, result: Dict[str, Any]) -> Dict[str, Any]:
 
     response: Dict[str, Any] = {
         "conversation_id": conversation_id
@@ -69,3 +155,74 @@ def chat(req: ChatRequest) -> Dict[str, Any]:
             response[key] = result[key]
 
     return response
+
+
+@app.post("/chat")
+async def chat(req: ChatRequest) -> Dict[str, Any]:
+
+    conversation_id = req.conversation_id or str(uuid.uuid4())
+
+    result = await _run_turn(conversation_id, req.user_message)
+
+    return _build_response(conversation_id, result)
+
+
+def _sse(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+@app.post("/chat/stream")
+async def chat_stream(req: ChatRequest) -> StreamingResponse:
+    """
+    Server-sent events version of /chat. Emits "start" immediately, then
+    "node" (started/finished) and "tool" events as the graph runs, and
+    finally "final" with the same body /chat returns. Replies are built
+    by the agents, not generated by the LLM, so they arrive whole in the
+    conversation node's "finished" event; there are no token events.
+
+    Node and tool events carry the attempt that produced them. A turn that
+    loses a state version race is replayed after a "retry" event, and the
+    events of earlier attempts should then be discarded.
+
+    A client that disconnects only stops the events: the turn itself runs
+    to completion, so a booking or cancellation made on its way is also
+    persisted.
+    """
+
+    conversation_id = req.conversation_id or str(uuid.uuid4())
+    events: asyncio.Queue = asyncio.Queue()
+
+    async def run() -> None:
+        try:
+            result = await _run_turn(conversation_id, req.user_message, events)
+            events.put_nowait(("final", _build_response(conversation_id, result)))
+        except Exception as e:
+            events.put_nowait(("error", {"detail": str(e)}))
+        finally:
+            events.put_nowait(None)
+
+    async def body():
+        task = asyncio.create_task(run())
+
+        try:
+            yield _sse("start", {"conversation_id": conversation_id})
+
+            while True:
+                item = await events.get()
+                if item is None:
+                    break
+                yield _sse(*item)
+
+        finally:
+            if not task.done():
+                _detached_turns.add(task)
+                task.add_done_callback(_detached_turns.discard)
+
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"
+        }
+    )
@@ -0,0 +1,205 @@
+import re
+import string
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Sequence
+
+from dateutil import parser as dateutil_parser
+
+from app.tools.metrics import Counters
+
+# strptime formats worth learning. Each is only adopted after dateutil
+# has parsed an input to exactly what the format gives, so the fast tier
+# never changes an answer.
+CANDIDATE_FORMATS = (
+    "%Y-%m-%d %H:%M",
+    "%Y-%m-%d %I:%M %p",
+    "%Y-%m-%d %I:%M%p",
+    "%Y-%m-%d %I %p",
+    "%Y-%m-%d %I%p",
+    "%Y/%m/%d %H:%M",
+    "%d/%m/%Y %H:%M",
+    "%d/%m/%Y %I:%M %p",
+    "%d/%m/%Y %I:%M%p",
+    "%d/%m/%Y %I %p",
+    "%d/%m/%Y %I%p",
+    "%d/%m/%Y, %I:%M %p",
+    "%m/%d/%Y %H:%M",
+    "%m/%d/%Y %I:%M %p",
+    "%m/%d/%Y %I:%M%p",
+    "%m/%d/%Y %I %p",
+    "%m/%d/%Y %I%p",
+    "%d-%m-%Y %H:%M",
+    "%m-%d-%Y %H:%M",
+    "%d %B %Y %H:%M",
+    "%d %B %Y %I:%M %p",
+    "%d %B %Y %I%p",
+    "%d %b %Y %H:%M",
+    "%d %b %Y %I:%M %p",
+    "%d %b %Y %I%p",
+    "%B %d %Y %H:%M",
+    "%B %d %Y %I:%M %p",
+    "%B %d, %Y %I:%M %p",
+    "%b %d %Y %H:%M",
+    "%b %d %Y %I:%M %p",
+)
+
+MAX_LEARNED_FORMATS = 64
+
+
+def _day_first(fmt: str) -> bool:
+    """True for numeric day-before-month formats such as %d/%m/%Y."""
+    day, month = fmt.find("%d"), fmt.find("%m")
+    return day != -1 and month != -1 and day < month
+
+
+class _LearnedFormat:
+    __slots__ = ("fmt", "day_first", "hits")
+
+    def __init__(self, fmt: str):
+        self.fmt = fmt
+        self.day_first = _day_first(fmt)
+        self.hits = 0
+
+
+_SHAPE_TABLE = str.maketrans(
+    "0123456789" + string.ascii_letters,
+    "9" * 10 + "a" * len(string.ascii_letters),
+)
+_RUNS = re.compile(r"(.)\1+")
+
+
+def text_shape(text: str) -> str:
+    """ "10/02/2026 11am" -> "9/9/9 9a": which learned formats could apply."""
+    return _RUNS.sub(r"\1", text.translate(_SHAPE_TABLE))
+
+
+class TieredDatetimeParser:
+    """
+    datetime.fromisoformat first, then the strptime formats learned from
+    earlier inputs of the same shape (most-hit first), and dateutil only
+    for the rest. Keying formats by shape means a failed strptime attempt,
+    which costs about as much as a successful one, is rare.
+
+    dateutil reads "10/02/2026" month-first and only falls back to
+    day-first when the first number cannot be a month. A learned day-first
+    format therefore only answers when the day is above 12 (or equals the
+    month), so every tier agrees with dateutil.
+    """
+
+    def __init__(self, candidate_formats: Sequence[str] = CANDIDATE_FORMATS, max_learned: int = MAX_LEARNED_FORMATS):
+        self.candidate_formats = tuple(candidate_formats)
+        self.max_learned = max_learned
+        self.counters = Counters("iso", "learned", "dateutil", "failed")
+
+        self._by_shape: Dict[str, List[_LearnedFormat]] = {}
+        self._learned_count = 0
+        self._lock = threading.Lock()
+
+    def parse(self, text: str) -> datetime:
+
+        text = " ".join((text or "").split())
+
+        try:
+            value = datetime.fromisoformat(text)
+            self.counters.inc("iso")
+            return value
+        except ValueError:
+            pass
+
+        shape = text_shape(text)
+
+        value = self._parse_learned(text, shape)
+        if value is not None:
+            self.counters.inc("learned")
+            return value
+
+        try:
+            value = dateutil_parser.parse(text)
+        except (ValueError, OverflowError) as e:
+            self.counters.inc("failed")
+            raise ValueError(f"unsupported datetime format: {text!r}") from e
+
+        self.counters.inc("dateutil")
+
+        if value.tzinfo is None:
+            self._learn(text, shape, value)
+
+        return value
+
+    def _parse_learned(self, text: str, shape: str):
+
+        with self._lock:
+            learned = list(self._by_shape.get(shape, ()))
+
+        for entry in learned:
+            try:
+                value = datetime.strptime(text, entry.fmt)
+            except ValueError:
+                continue
+
+            if entry.day_first and value.day <= 12 and value.day != value.month:
+                # Ambiguous: dateutil reads it month-first, so leave it to
+                # a month-first format or to dateutil.
+                continue
+
+            self._record_hit(shape, entry)
+            return value
+
+        return None
+
+    def _record_hit(self, shape: str, entry: _LearnedFormat) -> None:
+        with self._lock:
+            entry.hits += 1
+
+            # Keep each shape's list ordered by hits.
+            entries = self._by_shape[shape]
+            position = entries.index(entry)
+            while position > 0 and entries[position - 1].hits < entry.hits:
+                entries[position - 1], entries[position] = entry, entries[position - 1]
+                position -= 1
+
+    def _learn(self, text: str, shape: str, value: datetime) -> None:
+
+        with self._lock:
+            if self._learned_count >= self.max_learned:
+                return
+            known = {entry.fmt for entry in self._by_shape.get(shape, ())}
+
+        for fmt in self.candidate_formats:
+            if fmt in known:
+                continue
+
+            try:
+                if datetime.strptime(text, fmt) != value:
+                    continue
+            except ValueError:
+                continue
+
+            with self._lock:
+                entries = self._by_shape.setdefault(shape, [])
+                if all(entry.fmt != fmt for entry in entries) and self._learned_count < self.max_learned:
+                    entries.append(_LearnedFormat(fmt))
+                    self._learned_count += 1
+            return
+
+    def stats(self) -> Dict[str, Any]:
+        counts: Dict[str, Any] = self.counters.snapshot()
+        with self._lock:
+            counts["learned_formats"] = [
+                {"shape": shape, "format": entry.fmt, "hits": entry.hits}
+                for shape, entries in self._by_shape.items()
+                for entry in entries
+            ]
+        return counts
+
+
+_parser = TieredDatetimeParser()
+
+
+def parse_datetime(text: str) -> datetime:
+    return _parser.parse(text)
+
+
+def parser_stats() -> Dict[str, Any]:
+    return _parser.stats()
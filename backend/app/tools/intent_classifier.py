@@ -0,0 +1,82 @@
+import re
+from typing import Dict, Any, List, Tuple, Optional
+
+
+# (pattern, weight) per intent. Weights are tuned so that a single strong
+# cue ("cancel", "reschedule", "book") clears the default threshold on its
+# own, while weak cues only add up.
+_RULES: Dict[str, List[Tuple[str, float]]] = {
+    "cancel": [
+        (r"\bcancel\w*\b", 3.0),
+        (r"\b(call off|calling off|delete|remove|drop)\b.*\binterviews?\b", 2.0),
+        (r"\b(won't|will not|can't|cannot) (make|attend)\b", 1.5),
+    ],
+    "reschedule": [
+        (r"\bre-?schedul\w*\b", 3.0),
+        (r"\b(postpone|prepone)\w*\b", 3.0),
+        (r"\b(move|shift|change|push)\b.*\b(interview|time|date|slot)\b", 2.0),
+        (r"\b(another|different|new|later|earlier) (time|date|slot|day)\b", 1.5),
+    ],
+    "schedule": [
+        (r"\b(schedule|book|arrange|set up|setup)\b", 3.0),
+        (r"\b(need|want|like) (an|a|to have an?) interview\b", 2.0),
+        (r"\bnew interview\b", 1.5),
+    ],
+    "inquiry": [
+        (r"^\s*(hi|hello|hey|hola|good (morning|afternoon|evening))\b", 2.5),
+        (r"\b(what can you do|what do you do|who are you|how does this work)\b", 3.0),
+        (r"\b(list|show|see|view)\b.*\binterviews?\b", 3.0),
+        (r"\b(my|upcoming) interviews\b", 2.0),
+        (r"\bhelp\b", 1.0),
+    ],
+}
+
+_COMPILED: Dict[str, List[Tuple["re.Pattern[str]", float]]] = {
+    intent: [(re.compile(p, re.IGNORECASE), w) for p, w in rules]
+    for intent, rules in _RULES.items()
+}
+
+_NEGATION = re.compile(r"\b(don't|do not|dont|not|never|no longer)\b", re.IGNORECASE)
+
+# Score at which a lone intent is considered fully certain.
+_SATURATION = 3.0
+
+
+class LocalIntentClassifier:
+    """
+    Keyword/regex scorer used in front of the LLM. Returns the same
+    {"intent", "confidence"} shape as IntentDetectionAgent, or None when
+    nothing matched.
+    """
+
+    def classify(self, user_message: str) -> Optional[Dict[str, Any]]:
+
+        message = (user_message or "").strip()
+
+        if not message:
+            return None
+
+        scores = {
+            intent: sum(w for pattern, w in rules if pattern.search(message))
+            for intent, rules in _COMPILED.items()
+        }
+
+        ranked = sorted(scores.items(), key=lambda kv: kv[1], reverse=True)
+        (best, top), (_, second) = ranked[0], ranked[1]
+
+        if top <= 0:
+            return None
+
+        # Certainty drops when another intent also scored (mixed messages)
+        # and when the cue is weak on its own.
+        confidence = (top / (top + second)) * min(1.0, top / _SATURATION)
+
+        # "I don't want to cancel" reads like cancel to a keyword matcher;
+        # leave negated messages to the LLM.
+        if _NEGATION.search(message):
+            confidence *= 0.5
+
+        return {
+            "intent": best,
+            "confidence": round(confidence, 3)
+        }
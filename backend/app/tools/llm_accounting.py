@@ -0,0 +1,144 @@
+import os
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from app.tools.llm_guard import LatencyWindow
+from app.tools.metrics import Counters, Histogram
+
+LATENCY_MS_BUCKETS = (50, 100, 200, 400, 800, 1600, 3200, 6400)
+TOKEN_BUCKETS = (16, 32, 64, 128, 256, 512, 1024, 2048, 4096)
+
+# How many individual call records /metrics/llm/calls can show.
+RECENT_CALLS = int(os.getenv("LLM_RECENT_CALLS", "200"))
+
+OUTCOMES = ("ok", "error", "cancelled")
+
+
+class _SiteStats:
+    """Aggregates for one call site, e.g. "IntentDetectionAgent.intent"."""
+
+    def __init__(self):
+        self.counters = Counters(*OUTCOMES, "prompt_tokens", "completion_tokens")
+        self.latency_ms = Histogram(LATENCY_MS_BUCKETS)
+        self.ttft_ms = Histogram(LATENCY_MS_BUCKETS)
+        self.prompt_tokens = Histogram(TOKEN_BUCKETS)
+        self.completion_tokens = Histogram(TOKEN_BUCKETS)
+
+    def snapshot(self) -> Dict[str, Any]:
+        counts = self.counters.snapshot()
+        return {
+            "calls": {outcome: counts[outcome] for outcome in OUTCOMES},
+            "prompt_tokens_total": counts["prompt_tokens"],
+            "completion_tokens_total": counts["completion_tokens"],
+            "latency_ms": self.latency_ms.snapshot(),
+            "ttft_ms": self.ttft_ms.snapshot(),
+            "prompt_tokens": self.prompt_tokens.snapshot(),
+            "completion_tokens": self.completion_tokens.snapshot(),
+        }
+
+
+class _ModelStats:
+
+    def __init__(self):
+        self.counters = Counters("calls", "prompt_tokens", "completion_tokens")
+        self.latency = LatencyWindow()
+
+    def snapshot(self) -> Dict[str, Any]:
+        counts = self.counters.snapshot()
+        p50 = self.latency.percentile(50)
+        p95 = self.latency.percentile(95)
+        counts["latency_p50_ms"] = round(p50 * 1000, 1) if p50 is not None else None
+        counts["latency_p95_ms"] = round(p95 * 1000, 1) if p95 is not None else None
+        return counts
+
+
+_sites: Dict[str, _SiteStats] = {}
+_models: Dict[str, _ModelStats] = {}
+_recent: deque = deque(maxlen=max(1, RECENT_CALLS))
+_lock = threading.Lock()
+
+
+def _usage_tokens(usage: Any) -> Optional[tuple]:
+    if usage is None:
+        return None
+    return (
+        getattr(usage, "prompt_tokens", 0) or 0,
+        getattr(usage, "completion_tokens", 0) or 0,
+    )
+
+
+def record_llm_call(
+    site: str,
+    model: str,
+    outcome: str,
+    wall_seconds: float,
+    usage: Any = None,
+    ttft_seconds: Optional[float] = None,
+) -> None:
+    """
+    Record one LLM call. `usage` is the response's usage block (absent for
+    failed calls, and for streams that did not report one); `ttft_seconds`
+    is only known for streamed calls.
+    """
+
+    tokens = _usage_tokens(usage)
+
+    with _lock:
+        site_stats = _sites.get(site)
+        if site_stats is None:
+            site_stats = _sites[site] = _SiteStats()
+
+        model_stats = _models.get(model)
+        if model_stats is None:
+            model_stats = _models[model] = _ModelStats()
+
+        _recent.append({
+            "at": datetime.utcnow().isoformat(),
+            "site": site,
+            "model": model,
+            "outcome": outcome,
+            "wall_ms": round(wall_seconds * 1000, 1),
+            "ttft_ms": round(ttft_seconds * 1000, 1) if ttft_seconds is not None else None,
+            "prompt_tokens": tokens[0] if tokens else None,
+            "completion_tokens": tokens[1] if tokens else None,
+        })
+
+    site_stats.counters.inc(outcome)
+    site_stats.latency_ms.observe(wall_seconds * 1000)
+
+    if ttft_seconds is not None:
+        site_stats.ttft_ms.observe(ttft_seconds * 1000)
+
+    if tokens:
+        site_stats.counters.inc("prompt_tokens", tokens[0])
+        site_stats.counters.inc("completion_tokens", tokens[1])
+        site_stats.prompt_tokens.observe(tokens[0])
+        site_stats.completion_tokens.observe(tokens[1])
+
+    # Per-model latency describes the model, so only completed calls count.
+    if outcome == "ok":
+        model_stats.counters.inc("calls")
+        model_stats.latency.add(wall_seconds)
+        if tokens:
+            model_stats.counters.inc("prompt_tokens", tokens[0])
+            model_stats.counters.inc("completion_tokens", tokens[1])
+
+
+def site_stats() -> Dict[str, Any]:
+    with _lock:
+        items = list(_sites.items())
+    return {site: stats.snapshot() for site, stats in items}
+
+
+def per_model_stats() -> Dict[str, Any]:
+    with _lock:
+        items = list(_models.items())
+    return {model: stats.snapshot() for model, stats in items}
+
+
+def recent_calls(limit: int = 50) -> List[Dict[str, Any]]:
+    with _lock:
+        calls = list(_recent)
+    return calls[-limit:][::-1] if limit > 0 else []
@@ -0,0 +1,112 @@
+import asyncio
+import os
+import threading
+from typing import Dict
+
+import httpx
+from groq import AsyncGroq
+
+from app.config import GROQ_API_KEY, GROQ_BASE_URL
+
+# One connection pool for every agent, so TLS handshakes are paid once per
+# connection rather than once per client.
+MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "100"))
+MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", "20"))
+KEEPALIVE_EXPIRY_SECONDS = float(os.getenv("LLM_KEEPALIVE_EXPIRY_SECONDS", "60"))
+
+CONNECT_TIMEOUT_SECONDS = float(os.getenv("LLM_CONNECT_TIMEOUT_SECONDS", "5"))
+READ_TIMEOUT_SECONDS = float(os.getenv("LLM_READ_TIMEOUT_SECONDS", "30"))
+
+MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))
+
+# HTTP/2 needs the optional "h2" package (pip install httpx[http2]).
+HTTP2 = os.getenv("LLM_HTTP2", "false").lower() in ("1", "true", "yes")
+
+# Connections opened at startup so the first requests skip the handshake.
+WARM_CONNECTIONS = int(os.getenv("LLM_WARM_CONNECTIONS", "2"))
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _build_http_client() -> httpx.AsyncClient:
+
+    http2 = HTTP2 and _http2_available()
+
+    if HTTP2 and not http2:
+        print("LLM client: LLM_HTTP2 is set but h2 is not installed, using HTTP/1.1")
+
+    return httpx.AsyncClient(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=MAX_CONNECTIONS,
+            max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=KEEPALIVE_EXPIRY_SECONDS,
+        ),
+        timeout=httpx.Timeout(
+            READ_TIMEOUT_SECONDS,
+            connect=CONNECT_TIMEOUT_SECONDS,
+        ),
+    )
+
+
+_clients: Dict[str, AsyncGroq] = {}
+_clients_lock = threading.Lock()
+
+
+def get_llm_client(name: str = "groq") -> AsyncGroq:
+    """The process-wide client for `name`, created on first use."""
+
+    with _clients_lock:
+        client = _clients.get(name)
+
+        if client is None:
+            client = AsyncGroq(
+                api_key=GROQ_API_KEY,
+                base_url=GROQ_BASE_URL,
+                max_retries=MAX_RETRIES,
+                http_client=_build_http_client(),
+            )
+            _clients[name] = client
+
+        return client
+
+
+async def warm_llm_clients() -> None:
+    """
+    Open WARM_CONNECTIONS keep-alive connections per client with a cheap
+    models listing. Failures are only logged: the app must start even
+    when the LLM is unreachable.
+    """
+
+    with _clients_lock:
+        clients = list(_clients.items()) or [("groq", None)]
+
+    for name, client in clients:
+        client = client or get_llm_client(name)
+        quick = client.with_options(max_retries=0)
+
+        # Concurrent, so each listing needs a connection of its own.
+        results = await asyncio.gather(
+            *(quick.models.list() for _ in range(max(0, WARM_CONNECTIONS))),
+            return_exceptions=True
+        )
+
+        errors = [r for r in results if isinstance(r, Exception)]
+        if errors:
+            print(f"LLM client warm-up failed for {name}:", str(errors[0]))
+
+
+async def close_llm_clients() -> None:
+
+    with _clients_lock:
+        clients = list(_clients.values())
+        _clients.clear()
+
+    for client in clients:
+        await client.close()
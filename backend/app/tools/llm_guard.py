@@ -0,0 +1,288 @@
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+from app.tools.metrics import Counters
+
+T = TypeVar("T")
+
+# Hard ceiling on one LLM call, including any hedged duplicate.
+DEADLINE_SECONDS = float(os.getenv("LLM_DEADLINE_SECONDS", "8"))
+
+# Consecutive failures that open the breaker, and how long it stays open
+# before a single probe call is let through.
+BREAKER_FAILURE_THRESHOLD = int(os.getenv("LLM_BREAKER_FAILURE_THRESHOLD", "5"))
+BREAKER_RESET_SECONDS = float(os.getenv("LLM_BREAKER_RESET_SECONDS", "30"))
+
+# Send a second identical request once the first has been outstanding for
+# longer than the observed p95 latency.
+HEDGE_ENABLED = os.getenv("LLM_HEDGE_ENABLED", "false").lower() in ("1", "true", "yes")
+HEDGE_MIN_SAMPLES = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))
+LATENCY_WINDOW = int(os.getenv("LLM_LATENCY_WINDOW", "200"))
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the LLM while the breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Closed -> open after `failure_threshold` consecutive failures. After
+    `reset_seconds` it goes half-open and lets exactly one probe through;
+    the probe's outcome closes or re-opens it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_seconds: float = 30.0):
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.reset_seconds = float(reset_seconds)
+
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_seconds:
+            self._state = self.HALF_OPEN
+            self._probe_in_flight = False
+        return self._state
+
+    def allow(self) -> Optional[str]:
+        """
+        The state a call is let through in: CLOSED, or HALF_OPEN for the one
+        probe. None when the call must short-circuit.
+        """
+        with self._lock:
+            state = self._current_state()
+
+            if state == self.CLOSED:
+                return state
+
+            if state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return state
+
+            return None
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def release_probe(self) -> None:
+        """Forget an abandoned half-open probe so another may be sent."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._probe_in_flight = False
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "state": self._current_state(),
+                "consecutive_failures": self._failures,
+                "failure_threshold": self.failure_threshold,
+                "reset_seconds": self.reset_seconds,
+            }
+
+
+class LatencyWindow:
+    """The last N call latencies, for percentile estimates."""
+
+    def __init__(self, size: int = 200):
+        self._samples = deque(maxlen=max(1, int(size)))
+        self._lock = threading.Lock()
+
+    def add(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._samples)
+
+    def percentile(self, p: float) -> Optional[float]:
+        with self._lock:
+            if not self._samples:
+                return None
+            ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(round(p / 100.0 * (len(ordered) - 1))))
+        return ordered[index]
+
+
+class GuardedLLM:
+    """
+    Wraps one kind of LLM call with a deadline, a circuit breaker and an
+    optional hedged retry. Callers keep their own fallbacks: `call` raises
+    CircuitOpenError, asyncio.TimeoutError or the client's own exception,
+    and the agent's existing `except Exception` turns that into its usual
+    fallback answer - now immediately instead of after a client timeout.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        deadline_seconds: float = DEADLINE_SECONDS,
+        breaker: Optional[CircuitBreaker] = None,
+        hedge: bool = HEDGE_ENABLED,
+        hedge_min_samples: int = HEDGE_MIN_SAMPLES,
+    ):
+        self.name = name
+        self.deadline_seconds = float(deadline_seconds)
+        self.breaker = breaker or CircuitBreaker(BREAKER_FAILURE_THRESHOLD, BREAKER_RESET_SECONDS)
+        self.hedge = hedge
+        self.hedge_min_samples = hedge_min_samples
+        self.latency = LatencyWindow(LATENCY_WINDOW)
+        self.counters = Counters(
+            "calls", "successes", "failures", "timeouts",
+            "short_circuits", "hedges", "hedge_wins",
+        )
+
+    async def call(
+        self,
+        fn: Callable[[], Awaitable[T]],
+        hedge: Optional[bool] = None,
+    ) -> T:
+        """
+        `fn` must start a fresh request each time it is called. Pass
+        hedge=False for calls that cannot safely be duplicated, such as a
+        stream whose tokens are already being forwarded.
+        """
+
+        self.counters.inc("calls")
+
+        admitted = self.breaker.allow()
+
+        if admitted is None:
+            self.counters.inc("short_circuits")
+            raise CircuitOpenError(f"{self.name}: circuit open")
+
+        use_hedge = self.hedge if hedge is None else hedge
+        started = time.monotonic()
+
+        try:
+            if use_hedge:
+                result = await asyncio.wait_for(self._hedged(fn), self.deadline_seconds)
+            else:
+                result = await asyncio.wait_for(fn(), self.deadline_seconds)
+        except asyncio.TimeoutError:
+            self.counters.inc("timeouts")
+            self.counters.inc("failures")
+            self.breaker.record_failure()
+            raise
+        except asyncio.CancelledError:
+            # The caller gave up, which says nothing about the LLM's
+            # health. Only the call that took the half-open probe may hand
+            # it back.
+            if admitted == CircuitBreaker.HALF_OPEN:
+                self.breaker.release_probe()
+            raise
+        except Exception:
+            self.counters.inc("failures")
+            self.breaker.record_failure()
+            raise
+
+        self.latency.add(time.monotonic() - started)
+        self.counters.inc("successes")
+        self.breaker.record_success()
+
+        return result
+
+    async def _hedged(self, fn: Callable[[], Awaitable[T]]) -> T:
+
+        p95 = self.latency.percentile(95) if len(self.latency) >= self.hedge_min_samples else None
+
+        first = asyncio.ensure_future(fn())
+
+        if p95 is None:
+            return await first
+
+        tasks = [first]
+
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=p95)
+
+            if done:
+                return first.result()
+
+            self.counters.inc("hedges")
+            tasks.append(asyncio.ensure_future(fn()))
+
+            pending = set(tasks)
+            error: Optional[BaseException] = None
+
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+
+                for task in done:
+                    if task.exception() is None:
+                        if task is not first:
+                            self.counters.inc("hedge_wins")
+                        return task.result()
+                    error = task.exception()
+
+            raise error
+        finally:
+            # The loser, or both when the deadline cancels us.
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        counts = self.counters.snapshot()
+        counts["breaker"] = self.breaker.snapshot()
+        counts["deadline_seconds"] = self.deadline_seconds
+        counts["hedge_enabled"] = self.hedge
+        p50 = self.latency.percentile(50)
+        p95 = self.latency.percentile(95)
+        counts["latency_p50_ms"] = round(p50 * 1000, 1) if p50 is not None else None
+        counts["latency_p95_ms"] = round(p95 * 1000, 1) if p95 is not None else None
+        return counts
+
+
+# Every call site talks to the same provider, so they share one breaker:
+# an outage seen by one site also short-circuits the others.
+_breaker = CircuitBreaker(BREAKER_FAILURE_THRESHOLD, BREAKER_RESET_SECONDS)
+
+_guards: Dict[str, GuardedLLM] = {}
+_guards_lock = threading.Lock()
+
+
+def guard_for(name: str) -> GuardedLLM:
+    """One guard (latency window, counters) per call site, created on first use."""
+    with _guards_lock:
+        guard = _guards.get(name)
+        if guard is None:
+            guard = GuardedLLM(name, breaker=_breaker)
+            _guards[name] = guard
+        return guard
+
+
+def guard_stats() -> Dict[str, Any]:
+    with _guards_lock:
+        guards = list(_guards.values())
+    return {
+        "breaker": _breaker.snapshot(),
+        "calls": {guard.name: guard.stats() for guard in guards},
+    }
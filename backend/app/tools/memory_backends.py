@@ -0,0 +1,626 @@
+import sqlite3
+import os
+import threading
+import time
+from typing import Dict, Any, Optional, List, Iterable, Tuple, Union
+
+
+Payload = Union[str, bytes]
+
+
+DB_PATH = "interview_scheduler.db"
+
+BUSY_TIMEOUT_MS = int(os.getenv("MEMORY_BUSY_TIMEOUT_MS", "5000"))
+SYNCHRONOUS = os.getenv("MEMORY_SYNCHRONOUS", "NORMAL").upper()
+
+if SYNCHRONOUS not in ("OFF", "NORMAL", "FULL", "EXTRA"):
+    SYNCHRONOUS = "NORMAL"
+
+# Conversations untouched for longer than TTL_SECONDS are treated as gone.
+# 0 keeps them forever.
+TTL_SECONDS = float(os.getenv("MEMORY_TTL_SECONDS", str(7 * 24 * 3600)))
+
+# Set when several worker processes write conversations to the same
+# SQLite file, so a state cached by one of them can go stale.
+SQLITE_SHARED = os.getenv("MEMORY_SQLITE_SHARED", "false").lower() in ("1", "true", "yes")
+
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+REDIS_KEY_PREFIX = os.getenv("MEMORY_REDIS_KEY_PREFIX", "conversation_memory:")
+
+
+def _expiry_cutoff(now: Optional[float] = None) -> float:
+    if TTL_SECONDS <= 0:
+        return float("-inf")
+
+    return (now if now is not None else time.time()) - TTL_SECONDS
+
+
+class StateVersionConflict(Exception):
+    """A conditional save found that the stored state had moved on."""
+
+
+class MemoryBackend:
+    """
+    Storage for encoded conversation states.
+
+    Backends deal in already-encoded payloads (see memory_codec) and raise
+    on storage errors; memory_tool turns those into its None/False results.
+
+    Every stored state carries a version that goes up by one per write.
+    save() with expected_version is a compare-and-swap: it raises
+    StateVersionConflict instead of overwriting a newer state. Version 0
+    means "nothing stored yet".
+
+    `shared` backends may be written by other processes, so a copy of a
+    state cached in this one can go stale.
+    """
+
+    name = "base"
+    supports_patch = False
+    shared = False
+
+    def load(self, conversation_id: str) -> Optional[Payload]:
+        return self.load_versioned(conversation_id)[0]
+
+    def load_versioned(self, conversation_id: str) -> Tuple[Optional[Payload], int]:
+        raise NotImplementedError
+
+    def version(self, conversation_id: str) -> int:
+        """
+        The stored version without the payload, so a cached copy can be
+        checked cheaply. An expired state reports 0.
+        """
+        payload, version = self.load_versioned(conversation_id)
+        return version if payload is not None else 0
+
+    def load_many(self, conversation_ids: Iterable[str]) -> Dict[str, Payload]:
+        found = {}
+        for conversation_id in conversation_ids:
+            payload = self.load(conversation_id)
+            if payload is not None:
+                found[conversation_id] = payload
+        return found
+
+    def save(
+        self,
+        conversation_id: str,
+        payload: Payload,
+        patch: Optional[str] = None,
+        expected_version: Optional[int] = None
+    ) -> int:
+        """Store payload and return the new version."""
+        raise NotImplementedError
+
+    def save_many(self, items: Iterable[Tuple[str, Payload]]) -> None:
+        for conversation_id, payload in items:
+            self.save(conversation_id, payload)
+
+    def delete(self, conversation_id: str) -> None:
+        raise NotImplementedError
+
+    def sweep_expired(self, now: Optional[float] = None, batch_size: int = 200, pause_seconds: float = 0.0) -> List[str]:
+        """Remove expired conversations and return their ids."""
+        return []
+
+    def release_thread_connection(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class SQLiteMemoryBackend(MemoryBackend):
+
+    name = "sqlite"
+    supports_patch = True
+    shared = SQLITE_SHARED
+
+    def __init__(self, db_path: str = DB_PATH):
+        self.db_path = db_path
+
+        # One long-lived connection per worker thread. sqlite3 connections
+        # are cheap to keep open but expensive to set up, and WAL mode lets
+        # readers proceed while SQLAlchemy is writing interviews to the
+        # same file.
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+
+        self._init_table()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=BUSY_TIMEOUT_MS / 1000,
+            check_same_thread=False
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(f"PRAGMA synchronous={SYNCHRONOUS}")
+        conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+        return conn
+
+    def _get_connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+
+        return conn
+
+    def _discard_connection(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        self._local.conn = None
+
+        if conn is None:
+            return
+
+        with self._connections_lock:
+            if conn in self._connections:
+                self._connections.remove(conn)
+
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _init_table(self) -> None:
+        conn = self._get_connection()
+        cur = conn.cursor()
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS conversation_memory (
+                conversation_id TEXT PRIMARY KEY,
+                state_json TEXT NOT NULL,
+                created_at REAL NOT NULL DEFAULT 0,
+                updated_at REAL NOT NULL DEFAULT 0,
+                version INTEGER NOT NULL DEFAULT 0
+            )
+            """
+        )
+
+        columns = {row[1] for row in cur.execute("PRAGMA table_info(conversation_memory)")}
+
+        if "version" not in columns:
+            cur.execute(
+                "ALTER TABLE conversation_memory ADD COLUMN version INTEGER NOT NULL DEFAULT 0"
+            )
+
+        if "created_at" not in columns or "updated_at" not in columns:
+            for column in ("created_at", "updated_at"):
+                if column not in columns:
+                    cur.execute(
+                        f"ALTER TABLE conversation_memory ADD COLUMN {column} REAL NOT NULL DEFAULT 0"
+                    )
+
+            # Rows that predate the timestamps get a full TTL from now
+            # instead of being swept on the first pass.
+            now = time.time()
+            cur.execute(
+                "UPDATE conversation_memory SET created_at = ?, updated_at = ? WHERE updated_at = 0",
+                (now, now)
+            )
+
+        cur.execute(
+            """
+            CREATE INDEX IF NOT EXISTS ix_conversation_memory_updated_at
+            ON conversation_memory (updated_at)
+            """
+        )
+        conn.commit()
+
+    def load_versioned(self, conversation_id: str) -> Tuple[Optional[Payload], int]:
+        try:
+            row = self._get_connection().execute(
+                "SELECT state_json, version, updated_at FROM conversation_memory WHERE conversation_id = ?",
+                (conversation_id,)
+            ).fetchone()
+        except sqlite3.ProgrammingError:
+            self._discard_connection()
+            raise
+
+        if not row:
+            return None, 0
+
+        state_json, version, updated_at = row
+
+        # An expired row that has not been swept yet still reports its
+        # version so a compare-and-swap against it succeeds.
+        if updated_at < _expiry_cutoff():
+            return None, version
+
+        return state_json, version
+
+    def version(self, conversation_id: str) -> int:
+        try:
+            row = self._get_connection().execute(
+                "SELECT version, updated_at FROM conversation_memory WHERE conversation_id = ?",
+                (conversation_id,)
+            ).fetchone()
+        except sqlite3.ProgrammingError:
+            self._discard_connection()
+            raise
+
+        if not row or row[1] < _expiry_cutoff():
+            return 0
+
+        return row[0]
+
+    def _apply_patch(
+        self,
+        cur: sqlite3.Cursor,
+        conversation_id: str,
+        patch: str,
+        now: float,
+        expected_version: Optional[int]
+    ) -> bool:
+        cur.execute(
+            """
+            UPDATE conversation_memory
+            SET state_json = json_patch(state_json, ?), updated_at = ?, version = version + 1
+            WHERE conversation_id = ?
+              AND (? IS NULL OR version = ?)
+              AND typeof(state_json) = 'text'
+              AND json_valid(state_json)
+            """,
+            (patch, now, conversation_id, expected_version, expected_version)
+        )
+
+        return cur.rowcount == 1
+
+    def _write_full(
+        self,
+        cur: sqlite3.Cursor,
+        conversation_id: str,
+        payload: Payload,
+        now: float,
+        expected_version: Optional[int]
+    ) -> bool:
+        if expected_version is None:
+            cur.execute(
+                """
+                INSERT INTO conversation_memory (conversation_id, state_json, created_at, updated_at, version)
+                VALUES (?, ?, ?, ?, 1)
+                ON CONFLICT(conversation_id)
+                DO UPDATE SET
+                    state_json = excluded.state_json,
+                    updated_at = excluded.updated_at,
+                    version = conversation_memory.version + 1
+                """,
+                (conversation_id, payload, now, now)
+            )
+            return True
+
+        if expected_version == 0:
+            cur.execute(
+                """
+                INSERT INTO conversation_memory (conversation_id, state_json, created_at, updated_at, version)
+                VALUES (?, ?, ?, ?, 1)
+                ON CONFLICT(conversation_id) DO NOTHING
+                """,
+                (conversation_id, payload, now, now)
+            )
+            return cur.rowcount == 1
+
+        cur.execute(
+            """
+            UPDATE conversation_memory
+            SET state_json = ?, updated_at = ?, version = version + 1
+            WHERE conversation_id = ? AND version = ?
+            """,
+            (payload, now, conversation_id, expected_version)
+        )
+        return cur.rowcount == 1
+
+    def save(
+        self,
+        conversation_id: str,
+        payload: Payload,
+        patch: Optional[str] = None,
+        expected_version: Optional[int] = None
+    ) -> int:
+        conn = None
+        try:
+            conn = self._get_connection()
+            cur = conn.cursor()
+
+            now = time.time()
+
+            written = (
+                patch is not None
+                and self._apply_patch(cur, conversation_id, patch, now, expected_version)
+            )
+
+            if not written and not self._write_full(cur, conversation_id, payload, now, expected_version):
+                raise StateVersionConflict(conversation_id)
+
+            version = cur.execute(
+                "SELECT version FROM conversation_memory WHERE conversation_id = ?",
+                (conversation_id,)
+            ).fetchone()[0]
+
+            conn.commit()
+            return version
+
+        except sqlite3.ProgrammingError:
+            self._discard_connection()
+            raise
+
+        except Exception:
+            if conn:
+                conn.rollback()
+            raise
+
+    def delete(self, conversation_id: str) -> None:
+        conn = self._get_connection()
+        conn.execute(
+            "DELETE FROM conversation_memory WHERE conversation_id = ?",
+            (conversation_id,)
+        )
+        conn.commit()
+
+    def sweep_expired(self, now: Optional[float] = None, batch_size: int = 200, pause_seconds: float = 0.0) -> List[str]:
+        if TTL_SECONDS <= 0:
+            return []
+
+        cutoff = _expiry_cutoff(now)
+        removed: List[str] = []
+
+        conn = self._get_connection()
+
+        while True:
+            try:
+                rows = conn.execute(
+                    """
+                    SELECT conversation_id FROM conversation_memory
+                    WHERE updated_at < ?
+                    ORDER BY updated_at
+                    LIMIT ?
+                    """,
+                    (cutoff, batch_size)
+                ).fetchall()
+
+                if not rows:
+                    break
+
+                ids = [row[0] for row in rows]
+                placeholders = ",".join("?" for _ in ids)
+
+                # updated_at is re-checked so a conversation that was
+                # written between the SELECT and the DELETE survives.
+                conn.execute(
+                    f"""
+                    DELETE FROM conversation_memory
+                    WHERE conversation_id IN ({placeholders}) AND updated_at < ?
+                    """,
+                    (*ids, cutoff)
+                )
+                conn.commit()
+
+            except Exception:
+                conn.rollback()
+                break
+
+            removed.extend(ids)
+
+            if len(ids) < batch_size:
+                break
+
+            time.sleep(pause_seconds)
+
+        return removed
+
+    def release_thread_connection(self) -> None:
+        self._discard_connection()
+
+    def close(self) -> None:
+        with self._connections_lock:
+            conns = list(self._connections)
+            self._connections.clear()
+
+        for conn in conns:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+
+class InMemoryMemoryBackend(MemoryBackend):
+    """Process-local store; useful for tests, benchmarks and single-node dev."""
+
+    name = "memory"
+
+    def __init__(self):
+        self._data: Dict[str, Tuple[Payload, float, int]] = {}
+        self._lock = threading.Lock()
+
+    def load_versioned(self, conversation_id: str) -> Tuple[Optional[Payload], int]:
+        with self._lock:
+            entry = self._data.get(conversation_id)
+
+        if entry is None:
+            return None, 0
+
+        payload, updated_at, version = entry
+
+        if updated_at < _expiry_cutoff():
+            return None, version
+
+        return payload, version
+
+    def save(
+        self,
+        conversation_id: str,
+        payload: Payload,
+        patch: Optional[str] = None,
+        expected_version: Optional[int] = None
+    ) -> int:
+        with self._lock:
+            entry = self._data.get(conversation_id)
+            current = entry[2] if entry else 0
+
+            if expected_version is not None and expected_version != current:
+                raise StateVersionConflict(conversation_id)
+
+            self._data[conversation_id] = (payload, time.time(), current + 1)
+            return current + 1
+
+    def delete(self, conversation_id: str) -> None:
+        with self._lock:
+            self._data.pop(conversation_id, None)
+
+    def sweep_expired(self, now: Optional[float] = None, batch_size: int = 200, pause_seconds: float = 0.0) -> List[str]:
+        if TTL_SECONDS <= 0:
+            return []
+
+        cutoff = _expiry_cutoff(now)
+
+        with self._lock:
+            expired = [
+                conversation_id
+                for conversation_id, (_, updated_at, _) in self._data.items()
+                if updated_at < cutoff
+            ]
+            for conversation_id in expired:
+                del self._data[conversation_id]
+
+        return expired
+
+    def close(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+class RedisMemoryBackend(MemoryBackend):
+    """
+    Shared store for multi-node deployments.
+
+    Expiry is left to Redis (SET ... EX), so there is nothing to sweep.
+    The version lives in a sibling key; conditional saves WATCH it and
+    write payload and version in one MULTI/EXEC. Any client speaking the
+    redis-py API can be passed in, for example fakeredis.FakeRedis() in
+    tests.
+    """
+
+    name = "redis"
+    shared = True
+
+    def __init__(self, url: str = REDIS_URL, client: Any = None, key_prefix: str = REDIS_KEY_PREFIX):
+        try:
+            import redis
+        except ImportError:
+            redis = None
+
+        if client is None:
+            if redis is None:
+                raise RuntimeError("MEMORY_BACKEND=redis requires the 'redis' package")
+
+            client = redis.Redis.from_url(url)
+
+        self._watch_error = redis.WatchError if redis is not None else ()
+
+        self.client = client
+        self.key_prefix = key_prefix
+
+    def _key(self, conversation_id: str) -> str:
+        return f"{self.key_prefix}{conversation_id}"
+
+    def _version_key(self, conversation_id: str) -> str:
+        return f"{self.key_prefix}{conversation_id}:version"
+
+    def _expiry(self) -> Optional[int]:
+        return int(TTL_SECONDS) if TTL_SECONDS > 0 else None
+
+    def load_versioned(self, conversation_id: str) -> Tuple[Optional[Payload], int]:
+        pipe = self.client.pipeline(transaction=False)
+        pipe.get(self._key(conversation_id))
+        pipe.get(self._version_key(conversation_id))
+        payload, version = pipe.execute()
+
+        return payload, int(version or 0)
+
+    def version(self, conversation_id: str) -> int:
+        return int(self.client.get(self._version_key(conversation_id)) or 0)
+
+    def load_many(self, conversation_ids: Iterable[str]) -> Dict[str, Payload]:
+        ids = list(conversation_ids)
+
+        pipe = self.client.pipeline(transaction=False)
+        for conversation_id in ids:
+            pipe.get(self._key(conversation_id))
+
+        return {
+            conversation_id: payload
+            for conversation_id, payload in zip(ids, pipe.execute())
+            if payload is not None
+        }
+
+    def save(
+        self,
+        conversation_id: str,
+        payload: Payload,
+        patch: Optional[str] = None,
+        expected_version: Optional[int] = None
+    ) -> int:
+        key = self._key(conversation_id)
+        version_key = self._version_key(conversation_id)
+
+        with self.client.pipeline() as pipe:
+            while True:
+                try:
+                    pipe.watch(version_key)
+
+                    current = int(pipe.get(version_key) or 0)
+
+                    if expected_version is not None and expected_version != current:
+                        raise StateVersionConflict(conversation_id)
+
+                    pipe.multi()
+                    pipe.set(key, payload, ex=self._expiry())
+                    pipe.set(version_key, current + 1, ex=self._expiry())
+                    pipe.execute()
+
+                    return current + 1
+
+                except self._watch_error:
+                    # Another writer bumped the version after our read. That
+                    # is a conflict only for a conditional save; an
+                    # unconditional one just retries on the new version.
+                    if expected_version is not None:
+                        raise StateVersionConflict(conversation_id)
+
+    def save_many(self, items: Iterable[Tuple[str, Payload]]) -> None:
+        pipe = self.client.pipeline(transaction=False)
+        for conversation_id, payload in items:
+            pipe.set(self._key(conversation_id), payload, ex=self._expiry())
+            pipe.incr(self._version_key(conversation_id))
+            if self._expiry():
+                pipe.expire(self._version_key(conversation_id), self._expiry())
+        pipe.execute()
+
+    def delete(self, conversation_id: str) -> None:
+        self.client.delete(self._key(conversation_id), self._version_key(conversation_id))
+
+    def close(self) -> None:
+        try:
+            self.client.close()
+        except Exception:
+            pass
+
+
+BACKENDS = {
+    SQLiteMemoryBackend.name: SQLiteMemoryBackend,
+    InMemoryMemoryBackend.name: InMemoryMemoryBackend,
+    RedisMemoryBackend.name: RedisMemoryBackend,
+}
+
+
+def create_backend(name: str) -> MemoryBackend:
+    backend_cls = BACKENDS.get((name or "").lower())
+
+    if backend_cls is None:
+        raise RuntimeError(f"Unknown MEMORY_BACKEND: {name}")
+
+    return backend_cls()
@@ -0,0 +1,100 @@
+import json
+import os
+import zlib
+from typing import Any, Dict, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is listed in requirements.txt
+    orjson = None
+
+
+COMPRESS_THRESHOLD = int(os.getenv("MEMORY_COMPRESS_THRESHOLD", "4096"))
+COMPRESS_LEVEL = int(os.getenv("MEMORY_COMPRESS_LEVEL", "6"))
+
+# Compressed blobs carry a prefix that can never start a JSON document, so
+# rows written by older versions (plain json.dumps text) still decode.
+ZLIB_MAGIC = b"\x00z1"
+
+Payload = Union[str, bytes]
+
+
+def _dumps(state: Dict[str, Any]) -> str:
+    if orjson is not None:
+        return orjson.dumps(state).decode("utf-8")
+
+    return json.dumps(state, separators=(",", ":"), ensure_ascii=False)
+
+
+def _loads(raw: Union[str, bytes]) -> Any:
+    if orjson is not None:
+        return orjson.loads(raw)
+
+    return json.loads(raw)
+
+
+def encode_state(state: Dict[str, Any]) -> Payload:
+    """
+    Serialize a conversation state for storage.
+
+    Small states are stored as compact JSON text; anything at or above
+    COMPRESS_THRESHOLD bytes is zlib-compressed into a binary blob.
+    """
+    text = _dumps(state)
+
+    if COMPRESS_THRESHOLD <= 0 or len(text) < COMPRESS_THRESHOLD:
+        return text
+
+    return ZLIB_MAGIC + zlib.compress(text.encode("utf-8"), COMPRESS_LEVEL)
+
+
+def decode_state(raw: Payload) -> Optional[Dict[str, Any]]:
+    if raw is None:
+        return None
+
+    if isinstance(raw, memoryview):
+        raw = raw.tobytes()
+
+    if isinstance(raw, bytes) and raw.startswith(ZLIB_MAGIC):
+        raw = zlib.decompress(raw[len(ZLIB_MAGIC):])
+
+    data = _loads(raw)
+
+    if not isinstance(data, dict):
+        return None
+
+    return data
+
+
+def make_patch(
+    previous: Dict[str, Any],
+    current: Dict[str, Any]
+) -> Optional[Dict[str, Any]]:
+    """
+    Build an RFC 7396 merge patch holding only the top-level keys that
+    changed between two states.
+
+    Returns None when the change cannot be expressed safely as a merge
+    patch (a key set to None, or a changed dict value that would be merged
+    instead of replaced); the caller should fall back to a full write.
+    """
+    patch: Dict[str, Any] = {}
+
+    for key in previous:
+        if key not in current:
+            patch[key] = None
+
+    for key, value in current.items():
+        if key in previous and previous[key] == value:
+            continue
+
+        if value is None or isinstance(value, dict):
+            return None
+
+        patch[key] = value
+
+    return patch
+
+
+def encode_patch(patch: Dict[str, Any]) -> str:
+    return _dumps(patch)
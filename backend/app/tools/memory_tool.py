@@ -1,11 +1,42 @@
-import sqlite3
-import json
-from typing import Dict, Any, Optional
+import os
+import copy
+import time
+import asyncio
+import threading
+from contextlib import asynccontextmanager
+from typing import Dict, Any, Optional, Tuple, AsyncIterator
 
 from pydantic import BaseModel, Field
 
+from app.tools.lru_cache import TTLCache
+from app.tools.memory_backends import (
+    MemoryBackend,
+    StateVersionConflict,
+    TTL_SECONDS,
+    create_backend,
+)
+from app.tools.memory_codec import decode_state, encode_state, encode_patch, make_patch
 
-DB_PATH = "interview_scheduler.db"
+
+# "sqlite" (default), "memory" or "redis"; see memory_backends.
+BACKEND = os.getenv("MEMORY_BACKEND", "sqlite")
+
+# "full" rewrites the whole state on every save; "delta" sends only the
+# changed top-level keys as a JSON merge patch when the backend and the
+# stored row allow it.
+WRITE_MODE = os.getenv("MEMORY_WRITE_MODE", "delta").lower()
+
+CACHE_SIZE = int(os.getenv("MEMORY_CACHE_SIZE", "1024"))
+CACHE_TTL_SECONDS = float(os.getenv("MEMORY_CACHE_TTL_SECONDS", "300"))
+
+# With a shared backend, a cached state whose version was confirmed less
+# than this long ago is used without asking the backend again; 0 checks
+# on every hit. Process-local backends are never checked.
+CACHE_VERIFY_SECONDS = float(os.getenv("MEMORY_CACHE_VERIFY_SECONDS", "2"))
+
+SWEEP_INTERVAL_SECONDS = float(os.getenv("MEMORY_SWEEP_INTERVAL_SECONDS", "300"))
+SWEEP_BATCH_SIZE = int(os.getenv("MEMORY_SWEEP_BATCH_SIZE", "200"))
+SWEEP_BATCH_PAUSE_SECONDS = float(os.getenv("MEMORY_SWEEP_BATCH_PAUSE_SECONDS", "0.05"))
 
 
 class MemoryLoadInput(BaseModel):
@@ -26,89 +57,327 @@ class MemorySaveOutput(BaseModel):
     success: bool
 
 
-def _get_connection():
-    return sqlite3.connect(DB_PATH)
+_backend: MemoryBackend = create_backend(BACKEND)
 
 
-def _init_table():
-    conn = _get_connection()
-    try:
-        cur = conn.cursor()
-        cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS conversation_memory (
-                conversation_id TEXT PRIMARY KEY,
-                state_json TEXT NOT NULL
-            )
-            """
-        )
-        conn.commit()
-    finally:
-        conn.close()
+def get_backend() -> MemoryBackend:
+    return _backend
 
 
-_init_table()
+def set_backend(backend: MemoryBackend) -> None:
+    global _backend
 
+    _backend = backend
+    _cache.clear()
 
-def load_state(conversation_id: str) -> Optional[Dict[str, Any]]:
+
+def close_connections() -> None:
+    _backend.close()
+
+
+# Write-through cache of (decoded state, version, confirmed at). Callers
+# mutate the dicts they get back, so both directions go through a deep
+# copy. With a shared backend another worker may have written since, so
+# an entry older than CACHE_VERIFY_SECONDS is checked against the
+# backend's version first. A stale entry that slips through inside the
+# window fails the conditional write and is dropped, so the retry reloads.
+_cache = TTLCache(max_size=CACHE_SIZE, ttl_seconds=CACHE_TTL_SECONDS)
+
+
+def cache_stats() -> Dict[str, Any]:
+    stats = _cache.stats()
+    stats["backend"] = _backend.name
+    return stats
+
+
+def clear_cache() -> None:
+    _cache.clear()
+
+
+def load_state_versioned(conversation_id: str) -> Tuple[Optional[Dict[str, Any]], int]:
 
     MemoryLoadInput(conversation_id=conversation_id)
 
-    conn = None
-    try:
-        conn = _get_connection()
-        cur = conn.cursor()
+    cached = _cache.get(conversation_id)
+    if cached is not None:
+        state, version, confirmed_at = cached
+        now = time.monotonic()
 
-        cur.execute(
-            "SELECT state_json FROM conversation_memory WHERE conversation_id = ?",
-            (conversation_id,)
-        )
+        if not _backend.shared or now - confirmed_at < CACHE_VERIFY_SECONDS:
+            return copy.deepcopy(state), version
+
+        try:
+            current = _backend.version(conversation_id)
+        except Exception:
+            current = None
 
-        row = cur.fetchone()
+        if current == version:
+            _cache.set(conversation_id, (state, version, now))
+            return copy.deepcopy(state), version
 
-        if not row:
-            return None
+        _cache.delete(conversation_id)
+
+    try:
+        raw, version = _backend.load_versioned(conversation_id)
+
+        if raw is None:
+            return None, version
 
         try:
-            return json.loads(row[0])
+            state = decode_state(raw)
         except Exception:
-            return None
+            return None, version
+
+        if state is None:
+            return None, version
+
+        _cache.set(conversation_id, (copy.deepcopy(state), version, time.monotonic()))
+        return state, version
 
     except Exception:
-        return None
+        return None, 0
+
 
-    finally:
-        if conn:
-            conn.close()
+def peek_state(conversation_id: str) -> Optional[Dict[str, Any]]:
+    """
+    The cached state, without a backend round trip or a copy. It may be
+    stale and must not be modified; use it only for hints.
+    """
 
+    cached = _cache.peek(conversation_id)
+    return cached[0] if cached is not None else None
 
-def save_state(conversation_id: str, state: Dict[str, Any]) -> bool:
+
+def load_state(conversation_id: str) -> Optional[Dict[str, Any]]:
+    return load_state_versioned(conversation_id)[0]
+
+
+def _write_state(
+    conversation_id: str,
+    state: Dict[str, Any],
+    previous: Optional[Dict[str, Any]] = None,
+    expected_version: Optional[int] = None
+) -> int:
 
     MemorySaveInput(conversation_id=conversation_id, state=state)
 
-    conn = None
     try:
-        conn = _get_connection()
-        cur = conn.cursor()
-
-        cur.execute(
-            """
-            INSERT INTO conversation_memory (conversation_id, state_json)
-            VALUES (?, ?)
-            ON CONFLICT(conversation_id)
-            DO UPDATE SET state_json = excluded.state_json
-            """,
-            (conversation_id, json.dumps(state))
+        payload = encode_state(state)
+
+        # A patch only pays off while the row is plain JSON text; once the
+        # state crosses the compression threshold it is rewritten whole.
+        patch = None
+        if (
+            WRITE_MODE == "delta"
+            and _backend.supports_patch
+            and previous is not None
+            and isinstance(payload, str)
+        ):
+            changes = make_patch(previous, state)
+            if changes is not None:
+                patch = encode_patch(changes)
+                if len(patch) >= len(payload):
+                    patch = None
+
+        version = _backend.save(
+            conversation_id,
+            payload,
+            patch=patch,
+            expected_version=expected_version
         )
 
-        conn.commit()
-        return True
+    except Exception:
+        _cache.delete(conversation_id)
+        raise
 
+    _cache.set(conversation_id, (copy.deepcopy(state), version, time.monotonic()))
+    return version
+
+
+def save_state(
+    conversation_id: str,
+    state: Dict[str, Any],
+    previous: Optional[Dict[str, Any]] = None,
+    expected_version: Optional[int] = None
+) -> bool:
+    try:
+        _write_state(
+            conversation_id,
+            state,
+            previous=previous,
+            expected_version=expected_version
+        )
+        return True
     except Exception:
-        if conn:
-            conn.rollback()
         return False
 
-    finally:
-        if conn:
-            conn.close()
+
+def sweep_expired(now: Optional[float] = None, batch_size: int = SWEEP_BATCH_SIZE) -> int:
+    """
+    Delete conversations older than MEMORY_TTL_SECONDS, batch_size rows
+    per transaction, pausing between batches so interview writes are not
+    held behind the sweeper. Returns the number of conversations removed.
+    """
+    removed = _backend.sweep_expired(
+        now=now,
+        batch_size=batch_size,
+        pause_seconds=SWEEP_BATCH_PAUSE_SECONDS
+    )
+
+    for conversation_id in removed:
+        _cache.delete(conversation_id)
+
+    return len(removed)
+
+
+_sweeper_thread: Optional[threading.Thread] = None
+_sweeper_stop = threading.Event()
+
+
+def _sweeper_loop() -> None:
+    while not _sweeper_stop.wait(SWEEP_INTERVAL_SECONDS):
+        try:
+            sweep_expired()
+        except Exception as e:
+            print("Memory sweeper error:", str(e))
+
+    _backend.release_thread_connection()
+
+
+def start_sweeper() -> None:
+    global _sweeper_thread
+
+    if TTL_SECONDS <= 0 or SWEEP_INTERVAL_SECONDS <= 0:
+        return
+
+    if _sweeper_thread is not None and _sweeper_thread.is_alive():
+        return
+
+    _sweeper_stop.clear()
+    _sweeper_thread = threading.Thread(
+        target=_sweeper_loop,
+        name="conversation-memory-sweeper",
+        daemon=True
+    )
+    _sweeper_thread.start()
+
+
+def stop_sweeper() -> None:
+    global _sweeper_thread
+
+    _sweeper_stop.set()
+
+    if _sweeper_thread is not None:
+        _sweeper_thread.join(timeout=5)
+        _sweeper_thread = None
+
+
+class _KeyedLocks:
+    """
+    Per-key asyncio locks that are dropped again once nobody holds or
+    waits on them. asyncio.Lock wakes waiters in FIFO order, so turns are
+    applied in the order they arrived. Only used from the event loop.
+    """
+
+    def __init__(self):
+        self._locks: Dict[str, list] = {}
+
+    @asynccontextmanager
+    async def hold(self, key: str) -> AsyncIterator[None]:
+        entry = self._locks.get(key)
+        if entry is None:
+            entry = [asyncio.Lock(), 0]
+            self._locks[key] = entry
+        entry[1] += 1
+
+        try:
+            async with entry[0]:
+                yield
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._locks[key]
+
+
+_conversation_locks = _KeyedLocks()
+
+
+def conversation_lock(conversation_id: str):
+    """
+    Serialize turns of one conversation within this process. Different
+    conversations never wait on each other; across processes the version
+    check in ConversationMemory.flush catches the overlap instead.
+    """
+    return _conversation_locks.hold(conversation_id)
+
+
+class ConversationMemory:
+    """
+    Request-scoped handle on one conversation's stored state.
+
+    The state is read at most once per graph run. save() only records a
+    snapshot; the last snapshot is written by flush(), and only when it
+    differs from what was loaded. The write is conditional on the version
+    that was loaded, so a turn that raced another writer sets conflict
+    instead of overwriting it.
+    """
+
+    def __init__(self, conversation_id: str):
+        self.conversation_id = conversation_id
+        self.conflict = False
+
+        self._version = 0
+        self._loaded = False
+        self._persisted: Optional[Dict[str, Any]] = None
+        self._current: Optional[Dict[str, Any]] = None
+
+    @property
+    def dirty(self) -> bool:
+        return self._loaded and self._current != self._persisted
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        if not self._loaded:
+            self._persisted, self._version = load_state_versioned(self.conversation_id)
+            self._current = copy.deepcopy(self._persisted)
+            self._loaded = True
+
+        return copy.deepcopy(self._current)
+
+    def save(self, state: Dict[str, Any]) -> bool:
+        MemorySaveInput(conversation_id=self.conversation_id, state=state)
+
+        if not self._loaded:
+            self.load()
+
+        self._current = copy.deepcopy(state)
+        return True
+
+    def flush(self) -> bool:
+        if not self.dirty:
+            return True
+
+        try:
+            self._version = _write_state(
+                self.conversation_id,
+                self._current,
+                previous=self._persisted,
+                expected_version=self._version
+            )
+        except StateVersionConflict:
+            self.conflict = True
+            return False
+        except Exception:
+            return False
+
+        self._persisted = copy.deepcopy(self._current)
+        return True
+
+
+def memory_for(state: Dict[str, Any]) -> ConversationMemory:
+    memory = state.get("memory")
+
+    if memory is None:
+        memory = ConversationMemory(state.get("conversation_id"))
+        state["memory"] = memory
+
+    return memory
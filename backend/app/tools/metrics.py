@@ -0,0 +1,59 @@
+import threading
+from bisect import bisect_left
+from typing import Any, Dict, Sequence
+
+
+class Counters:
+    """A named group of thread-safe counters."""
+
+    def __init__(self, *names: str):
+        self._values: Dict[str, int] = {name: 0 for name in names}
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._values[name] = self._values.get(name, 0) + amount
+
+    def get(self, name: str) -> int:
+        with self._lock:
+            return self._values.get(name, 0)
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._values)
+
+
+class Histogram:
+    """
+    Thread-safe fixed-bucket histogram. Bucket "le_X" counts values above
+    the previous bound and up to X; "inf" counts the rest.
+    """
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = sorted(float(b) for b in buckets)
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._count = 0
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._count += 1
+            self._sum += value
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = list(self._counts)
+            total = self._count
+            value_sum = self._sum
+
+        labels = [f"le_{b:g}" for b in self.buckets] + ["inf"]
+
+        return {
+            "count": total,
+            "sum": round(value_sum, 3),
+            "mean": round(value_sum / total, 3) if total else 0.0,
+            "buckets": dict(zip(labels, counts)),
+        }
@@ -0,0 +1,76 @@
+import asyncio
+import os
+import time
+from typing import Any, Dict, Optional
+
+from app.tools.llm_accounting import per_model_stats, record_llm_call
+
+SMALL_MODEL = os.getenv("LLM_SMALL_MODEL", "llama-3.1-8b-instant")
+LARGE_MODEL = os.getenv("LLM_LARGE_MODEL", "llama-3.3-70b-versatile")
+
+
+class ModelRoute:
+    """
+    Which model a call site uses, and optionally a bigger model to retry
+    with when the first answer's confidence is below `escalate_below`.
+    """
+
+    def __init__(self, model: str, escalate_to: Optional[str] = None, escalate_below: float = 0.0):
+        self.model = model
+        self.escalate_to = escalate_to if escalate_to and escalate_to != model else None
+        self.escalate_below = float(escalate_below)
+
+    def should_escalate(self, confidence: float) -> bool:
+        return self.escalate_to is not None and confidence < self.escalate_below
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "model": self.model,
+            "escalate_to": self.escalate_to,
+            "escalate_below": self.escalate_below,
+        }
+
+
+# Four-way intent classification runs on the small model and escalates
+# when unsure; slot extraction stays on the large model by default.
+ROUTES: Dict[str, ModelRoute] = {
+    "intent": ModelRoute(
+        os.getenv("LLM_INTENT_MODEL", SMALL_MODEL),
+        escalate_to=os.getenv("LLM_INTENT_ESCALATE_MODEL", LARGE_MODEL),
+        escalate_below=float(os.getenv("LLM_INTENT_ESCALATE_BELOW", "0.75")),
+    ),
+    "intent_extract": ModelRoute(os.getenv("LLM_EXTRACT_MODEL", LARGE_MODEL)),
+}
+
+
+def route_for(site: str) -> ModelRoute:
+    return ROUTES[site]
+
+
+async def create_completion(client, model: str, site: str, **kwargs):
+    """
+    client.chat.completions.create on `model`, recorded under `site` (e.g.
+    "IntentDetectionAgent.intent") in the LLM call accounting.
+    """
+
+    started = time.monotonic()
+
+    try:
+        response = await client.chat.completions.create(model=model, **kwargs)
+    except asyncio.CancelledError:
+        record_llm_call(site, model, "cancelled", time.monotonic() - started)
+        raise
+    except Exception:
+        record_llm_call(site, model, "error", time.monotonic() - started)
+        raise
+
+    record_llm_call(site, model, "ok", time.monotonic() - started, getattr(response, "usage", None))
+
+    return response
+
+
+def model_stats() -> Dict[str, Any]:
+    return {
+        "routes": {site: route.describe() for site, route in ROUTES.items()},
+        "models": per_model_stats(),
+    }
@@ -0,0 +1,144 @@
+import re
+from typing import Dict, List, Optional
+
+# One alternation, scanned once with finditer. Name triggers match only the
+# trigger phrase, so whatever follows it (an email, a negation) is still
+# seen by the scan; the name itself is read with an anchored match.
+_SCAN = re.compile(
+    r"(?P<email>(?<![\w.-])[\w\.-]+@[\w\.-]+\.\w+)"
+    r"|(?P<timezone>\b[A-Za-z]+/[A-Za-z_]+|(?-i:\bIST\b))"
+    r"|(?P<negation>\b(?:no|nah|nope|not now|not really|don't want|do not want|dont want|stop|leave it"
+    r"|later|cancel it|forget it|never mind|nevermind|nothing|nothing else|no thanks|not interested)\b)"
+    r"|(?P<name_trigger>(?:\bmy name is\b|\bi am\b|\bi'm\b|\bthis is\b|\bmyself\b|\bname is\b|\bcall me\b"
+    r"|\bit is\b|\bim\b)\s+)"
+    r"|(?P<listing>\b(?:interview|interviews|my interviews|list)\b)",
+    re.IGNORECASE,
+)
+
+_NAME_WORDS = re.compile(r"[A-Za-z]+(?:\s+[A-Za-z]+){0,3}")
+
+# A reply to "May I know your full name?": the first run of words.
+_NAME_ANSWER = re.compile(r"[A-Za-z]+(?:\s+[A-Za-z]+)*")
+
+EMAIL = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+
+ACKNOWLEDGEMENT = re.compile(r"(?:ok|okay|no|yes|hmm|thanks|thank you)", re.IGNORECASE)
+
+# A reply accepting a "Did you mean ...?" suggestion.
+AFFIRMATION = re.compile(r"(?:y|yes|yeah|yep|yup|sure|correct|right|ok|okay)[.!]?", re.IGNORECASE)
+
+# Timezone mentions and a leading "on"/"at" are removed from a datetime
+# fragment before it is parsed.
+_DATETIME_NOISE = re.compile(r"\bIST\b|\b[A-Za-z]+/[A-Za-z_]+\b", re.IGNORECASE)
+_DATETIME_LEAD = re.compile(r"^\s*(?:on|at)\s+", re.IGNORECASE)
+
+
+def clean_datetime(text: str) -> str:
+    text = _DATETIME_NOISE.sub("", text or "")
+    return _DATETIME_LEAD.sub("", text).strip()
+
+
+def is_valid_email(value: str) -> bool:
+    return bool(EMAIL.fullmatch(value))
+
+
+def is_affirmation(user_message: str) -> bool:
+    return bool(AFFIRMATION.fullmatch((user_message or "").strip()))
+
+
+def name_answer(user_message: str) -> Optional[str]:
+    m = _NAME_ANSWER.search(user_message or "")
+    return m.group().strip() if m else None
+
+
+class SlotExtraction:
+    """Every candidate slot and flag found in one message."""
+
+    __slots__ = (
+        "email",
+        "name",
+        "timezone",
+        "datetime_fragment",
+        "choice",
+        "negations",
+        "mentions_interviews",
+        "acknowledgement",
+    )
+
+    def __init__(self):
+        self.email: Optional[str] = None
+        self.name: Optional[str] = None
+        self.timezone: Optional[str] = None
+        self.datetime_fragment: Optional[str] = None
+        self.choice: Optional[str] = None
+        self.negations: List[str] = []
+        self.mentions_interviews = False
+        self.acknowledgement = False
+
+    @property
+    def negated(self) -> bool:
+        return bool(self.negations)
+
+    def fields(self) -> Dict[str, str]:
+        """The booking fields, keyed like the conversation state."""
+
+        fields: Dict[str, str] = {}
+
+        if self.email:
+            fields["candidate_email"] = self.email
+        if self.name:
+            fields["candidate_name"] = self.name
+        if self.timezone:
+            fields["timezone"] = self.timezone
+        if self.datetime_fragment:
+            fields["preferred_datetime"] = self.datetime_fragment
+
+        return fields
+
+
+def extract_slots(user_message: str) -> SlotExtraction:
+
+    result = SlotExtraction()
+    message = (user_message or "").strip()
+
+    if not message:
+        return result
+
+    for m in _SCAN.finditer(message):
+        kind = m.lastgroup
+        value = m.group()
+
+        if kind == "email":
+            if result.email is None and is_valid_email(value):
+                result.email = value
+
+        elif kind == "timezone":
+            if result.timezone is None:
+                result.timezone = "Asia/Kolkata" if value.upper() == "IST" else value
+
+        elif kind == "negation":
+            result.negations.append(value.lower())
+
+        elif kind == "name_trigger":
+            if result.name is None:
+                name = _NAME_WORDS.match(message, m.end())
+                if name:
+                    result.name = name.group().strip()
+
+        elif kind == "listing":
+            result.mentions_interviews = True
+
+    # The datetime is whatever follows the last comma: "Asha, a@b.com,
+    # 2026-02-10 11:00 IST".
+    comma = message.rfind(",")
+    if comma != -1:
+        fragment = clean_datetime(message[comma + 1:])
+        if fragment:
+            result.datetime_fragment = fragment
+
+    if message.isdigit():
+        result.choice = message
+
+    result.acknowledgement = bool(ACKNOWLEDGEMENT.fullmatch(message))
+
+    return result
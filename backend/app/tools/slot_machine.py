@@ -0,0 +1,170 @@
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+from app.tools.slot_extractor import SlotExtraction
+
+
+class Reply:
+    """
+    How a turn ends. `extra` keys are added to the agent result (e.g.
+    selected_time_utc); `persist=False` leaves the stored state as loaded,
+    for replies that reject the message without using it.
+    """
+
+    __slots__ = ("text", "complete", "persist", "extra")
+
+    def __init__(self, text: str, complete: bool = False, persist: bool = True, **extra: Any):
+        self.text = text
+        self.complete = complete
+        self.persist = persist
+        self.extra = extra
+
+
+class Turn:
+    """One user message moving through a flow."""
+
+    def __init__(
+        self,
+        state: Dict[str, Any],
+        stored: Dict[str, Any],
+        message: str,
+        intent: Optional[str],
+        slots: SlotExtraction,
+    ):
+        self.state = state
+        self.stored = stored
+        self.message = message
+        self.intent = intent
+        self.slots = slots
+
+        self.awaiting = stored.get("awaiting_field")
+        self.path: List[str] = []
+
+
+Action = Callable[[Turn], Optional[Reply]]
+AnswerCheck = Callable[[Turn, str], Optional[Reply]]
+
+
+class Ask:
+    """Require `slot`: while it is empty, wait for it with `prompt`."""
+
+    __slots__ = ("name", "slot", "prompt")
+
+    def __init__(self, slot: str, prompt: str):
+        self.name = f"ask:{slot}"
+        self.slot = slot
+        self.prompt = prompt
+
+    def __call__(self, turn: Turn) -> Optional[Reply]:
+
+        if turn.stored.get(self.slot):
+            return None
+
+        turn.stored["awaiting_field"] = self.slot
+        return Reply(self.prompt)
+
+
+class Do:
+    """Run `action`; a Reply ends the turn, None moves to the next step."""
+
+    __slots__ = ("name", "action")
+
+    def __init__(self, name: str, action: Action):
+        self.name = name
+        self.action = action
+
+    def __call__(self, turn: Turn) -> Optional[Reply]:
+        return self.action(turn)
+
+
+class Flow:
+    """
+    The steps of one intent, run in order until one replies.
+
+    A `passive` flow does not take the message as an answer or record its
+    intent. A flow with `needs_message` hands an empty message to the
+    machine's default flow.
+    """
+
+    def __init__(self, steps: Sequence[Any], passive: bool = False, needs_message: bool = False):
+        self.steps = tuple(steps)
+        self.passive = passive
+        self.needs_message = needs_message
+
+
+class SlotMachine:
+    """
+    Per-intent slot-filling flows. A turn finds its flow by intent, applies
+    the message to the awaited field through `answers` (keyed by field;
+    anything else is stored as typed) and then walks the flow's steps. Both
+    lookups are dicts, so adding a flow or an answer check does not add work
+    to other turns.
+
+    `guards` see a non-passive turn before its answer is taken and may
+    reply instead, e.g. to a bare "ok".
+    """
+
+    def __init__(
+        self,
+        flows: Dict[str, Flow],
+        default: Flow,
+        answers: Optional[Dict[str, AnswerCheck]] = None,
+        guards: Iterable[Action] = (),
+    ):
+        self.flows = flows
+        self.default = default
+        self.answers = answers or {}
+        self.guards = tuple(guards)
+
+    def flow_for(self, turn: Turn) -> Flow:
+        flow = self.flows.get(turn.intent, self.default)
+        if flow.needs_message and not turn.message:
+            return self.default
+        return flow
+
+    def advance(self, turn: Turn) -> Reply:
+
+        flow = self.flow_for(turn)
+
+        if not flow.passive:
+
+            for guard in self.guards:
+                reply = guard(turn)
+                if reply is not None:
+                    turn.path.append("guard")
+                    return reply
+
+            reply = self._take_answer(turn)
+            if reply is not None:
+                return reply
+
+            if turn.intent:
+                turn.stored["intent"] = turn.intent
+
+        for step in flow.steps:
+            reply = step(turn)
+            if reply is not None:
+                turn.path.append(step.name)
+                return reply
+
+        turn.path.append("end")
+        return Reply("Please provide the required information.")
+
+    def _take_answer(self, turn: Turn) -> Optional[Reply]:
+
+        field = turn.awaiting
+
+        if not field or not turn.message:
+            return None
+
+        turn.path.append(f"answer:{field}")
+
+        check = self.answers.get(field)
+        if check is not None:
+            reply = check(turn, field)
+            if reply is not None:
+                return reply
+        else:
+            turn.stored[field] = turn.message.strip()
+
+        turn.stored.pop("awaiting_field", None)
+        return None
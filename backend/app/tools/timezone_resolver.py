@@ -0,0 +1,295 @@
+import difflib
+import heapq
+import os
+import re
+import threading
+from datetime import timedelta, timezone, tzinfo
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo, available_timezones
+
+from app.tools.metrics import Counters
+
+# A misspelt zone at least this similar to exactly one known name is
+# accepted as that zone; a weaker match is only offered as "did you mean".
+FUZZY_ACCEPT = float(os.getenv("TIMEZONE_FUZZY_ACCEPT", "0.9"))
+FUZZY_SUGGEST = float(os.getenv("TIMEZONE_FUZZY_SUGGEST", "0.7"))
+
+# Unknown inputs whose close matches are remembered.
+MAX_REMEMBERED_MISSES = 1024
+
+# What users type instead of an IANA name. Ambiguous abbreviations resolve
+# to the zone this app's users most likely mean (IST is India, CST is US
+# Central); the DST-aware zone is used for both the standard and the
+# daylight form. The spelt-out US zone names are listed too, since fuzzy
+# matching would take "eastern" for Pacific/Easter.
+ABBREVIATIONS = {
+    "ist": "Asia/Kolkata",
+    "et": "America/New_York",
+    "est": "America/New_York",
+    "edt": "America/New_York",
+    "ct": "America/Chicago",
+    "cst": "America/Chicago",
+    "cdt": "America/Chicago",
+    "mt": "America/Denver",
+    "mst": "America/Denver",
+    "mdt": "America/Denver",
+    "pt": "America/Los_Angeles",
+    "pst": "America/Los_Angeles",
+    "pdt": "America/Los_Angeles",
+    "eastern": "America/New_York",
+    "central": "America/Chicago",
+    "mountain": "America/Denver",
+    "pacific": "America/Los_Angeles",
+    "akst": "America/Anchorage",
+    "akdt": "America/Anchorage",
+    "hst": "Pacific/Honolulu",
+    "brt": "America/Sao_Paulo",
+    "art": "America/Argentina/Buenos_Aires",
+    "gmt": "UTC",
+    "utc": "UTC",
+    "z": "UTC",
+    "bst": "Europe/London",
+    "wet": "Europe/Lisbon",
+    "west": "Europe/Lisbon",
+    "cet": "Europe/Paris",
+    "cest": "Europe/Paris",
+    "eet": "Europe/Athens",
+    "eest": "Europe/Athens",
+    "msk": "Europe/Moscow",
+    "wat": "Africa/Lagos",
+    "cat": "Africa/Maputo",
+    "eat": "Africa/Nairobi",
+    "sast": "Africa/Johannesburg",
+    "gst": "Asia/Dubai",
+    "pkt": "Asia/Karachi",
+    "npt": "Asia/Kathmandu",
+    "ict": "Asia/Bangkok",
+    "wib": "Asia/Jakarta",
+    "sgt": "Asia/Singapore",
+    "hkt": "Asia/Hong_Kong",
+    "pht": "Asia/Manila",
+    "jst": "Asia/Tokyo",
+    "kst": "Asia/Seoul",
+    "awst": "Australia/Perth",
+    "acst": "Australia/Adelaide",
+    "acdt": "Australia/Adelaide",
+    "aest": "Australia/Sydney",
+    "aedt": "Australia/Sydney",
+    "nzst": "Pacific/Auckland",
+    "nzdt": "Pacific/Auckland",
+}
+
+# Cities people name that are not themselves IANA zone cities.
+CITY_ALIASES = {
+    "india": "Asia/Kolkata",
+    "bangalore": "Asia/Kolkata",
+    "bengaluru": "Asia/Kolkata",
+    "mumbai": "Asia/Kolkata",
+    "bombay": "Asia/Kolkata",
+    "delhi": "Asia/Kolkata",
+    "new_delhi": "Asia/Kolkata",
+    "chennai": "Asia/Kolkata",
+    "hyderabad": "Asia/Kolkata",
+    "pune": "Asia/Kolkata",
+    "calcutta": "Asia/Kolkata",
+    "nyc": "America/New_York",
+    "boston": "America/New_York",
+    "washington": "America/New_York",
+    "miami": "America/New_York",
+    "atlanta": "America/New_York",
+    "dallas": "America/Chicago",
+    "houston": "America/Chicago",
+    "austin": "America/Chicago",
+    "san_francisco": "America/Los_Angeles",
+    "sf": "America/Los_Angeles",
+    "seattle": "America/Los_Angeles",
+    "beijing": "Asia/Shanghai",
+    "abu_dhabi": "Asia/Dubai",
+}
+
+# IANA areas whose cities may be named on their own ("Kolkata"). Legacy
+# aliases such as US/Eastern stay reachable by full name only.
+_CITY_AREAS = {
+    "Africa", "America", "Antarctica", "Asia", "Atlantic",
+    "Australia", "Europe", "Indian", "Pacific",
+}
+
+_SEPARATORS = re.compile(r"[\s_]+")
+
+
+def _key(text: str) -> str:
+    """Index key: case-folded, whitespace and underscores collapsed to "_"."""
+    return _SEPARATORS.sub("_", (text or "").strip().casefold())
+
+
+@lru_cache(maxsize=None)
+def zone(name: str) -> ZoneInfo:
+    """Cached ZoneInfo by exact IANA name."""
+    return ZoneInfo(name)
+
+
+UTC = zone("UTC")
+
+
+def _offset_name(minutes: int) -> str:
+    sign = "+" if minutes >= 0 else "-"
+    hours, mins = divmod(abs(minutes), 60)
+    return f"UTC{sign}{hours:02d}:{mins:02d}"
+
+
+def _offset_keys(minutes: int):
+    sign = "+" if minutes >= 0 else "-"
+    hours, mins = divmod(abs(minutes), 60)
+
+    forms = [f"{hours}:{mins:02d}", f"{hours:02d}:{mins:02d}", f"{hours:02d}{mins:02d}"]
+    if mins == 0:
+        forms += [f"{hours}", f"{hours:02d}"]
+
+    for prefix in ("utc", "gmt", ""):
+        for form in forms:
+            yield f"{prefix}{sign}{form}"
+
+
+class TimezoneMatch:
+    __slots__ = ("name", "tz")
+
+    def __init__(self, name: str, tz: tzinfo):
+        self.name = name
+        self.tz = tz
+
+
+class TimezoneResolver:
+    """
+    Resolves what a user typed as their timezone ("ist", "kolkata",
+    "Asia/kolkata", "UTC+5:30", "new york") through one precomputed dict,
+    built once from the IANA database plus the abbreviation, city and
+    offset tables above. Each entry holds its tzinfo, so a hit does not
+    construct anything.
+
+    A miss is matched against the index keys with difflib: a near-certain
+    typo resolves, anything weaker comes back as a suggestion.
+    """
+
+    def __init__(self, fuzzy_accept: float = FUZZY_ACCEPT, fuzzy_suggest: float = FUZZY_SUGGEST):
+        self.fuzzy_accept = fuzzy_accept
+        self.fuzzy_suggest = fuzzy_suggest
+        self.counters = Counters("hits", "corrected", "suggested", "misses")
+
+        self._index: Dict[str, TimezoneMatch] = {}
+        self._suggestions: Dict[str, List[Tuple[str, float]]] = {}
+        self._lock = threading.Lock()
+        self._build()
+
+    def _add(self, key: str, name: str, tz: Optional[tzinfo] = None) -> None:
+        if key not in self._index:
+            self._index[key] = TimezoneMatch(name, tz or zone(name))
+
+    def _build(self) -> None:
+
+        names = sorted(available_timezones())
+
+        # Explicit tables first so they win over IANA legacy names such as
+        # "EST" (a fixed UTC-5 with no DST).
+        for key, name in {**ABBREVIATIONS, **CITY_ALIASES}.items():
+            self._add(key, name)
+
+        for name in names:
+            self._add(_key(name), name)
+
+        for name in names:
+            parts = name.split("/")
+            if len(parts) > 1 and parts[0] in _CITY_AREAS:
+                self._add(_key(parts[-1]), name)
+
+        for minutes in range(-12 * 60, 14 * 60 + 1, 15):
+            name = _offset_name(minutes)
+            tz = UTC if minutes == 0 else timezone(timedelta(minutes=minutes), name)
+            for key in _offset_keys(minutes):
+                self._add(key, "UTC" if minutes == 0 else name, tz)
+
+        self._keys = list(self._index)
+
+    def resolve(self, text: str) -> Optional[TimezoneMatch]:
+        """The zone `text` names, a confidently corrected typo, or None."""
+
+        key = _key(text)
+        match = self._index.get(key)
+
+        if match is not None:
+            self.counters.inc("hits")
+            return match
+
+        close = self._close_matches(key) if key else []
+
+        # Accept a typo only when every near-certain candidate is one zone.
+        confident = {self._index[k].name for k, score in close if score >= self.fuzzy_accept}
+
+        if len(confident) == 1:
+            self.counters.inc("corrected")
+            return self._index[close[0][0]]
+
+        self.counters.inc("misses")
+        return None
+
+    def suggest(self, text: str) -> Optional[str]:
+        """Best "did you mean" zone name for an unresolved `text`."""
+
+        key = _key(text)
+        close = self._close_matches(key) if key else []
+
+        if not close:
+            return None
+
+        self.counters.inc("suggested")
+        return self._index[close[0][0]].name
+
+    def _close_matches(self, key: str) -> List[Tuple[str, float]]:
+        """Up to three (index key, similarity) pairs, best first."""
+
+        with self._lock:
+            cached = self._suggestions.get(key)
+        if cached is not None:
+            return cached
+
+        matcher = difflib.SequenceMatcher(b=key)
+        scored = []
+
+        for candidate in self._keys:
+            matcher.set_seq1(candidate)
+            if (
+                matcher.real_quick_ratio() >= self.fuzzy_suggest
+                and matcher.quick_ratio() >= self.fuzzy_suggest
+            ):
+                score = matcher.ratio()
+                if score >= self.fuzzy_suggest:
+                    scored.append((candidate, score))
+
+        scored = heapq.nlargest(3, scored, key=lambda item: item[1])
+
+        with self._lock:
+            if len(self._suggestions) >= MAX_REMEMBERED_MISSES:
+                self._suggestions.clear()
+            self._suggestions[key] = scored
+
+        return scored
+
+    def stats(self) -> Dict[str, Any]:
+        counts: Dict[str, Any] = self.counters.snapshot()
+        counts["index_size"] = len(self._index)
+        return counts
+
+
+_resolver = TimezoneResolver()
+
+
+def resolve_timezone(text: str) -> Optional[TimezoneMatch]:
+    return _resolver.resolve(text)
+
+
+def suggest_timezone(text: str) -> Optional[str]:
+    return _resolver.suggest(text)
+
+
+def resolver_stats() -> Dict[str, Any]:
+    return _resolver.stats()
@@ -1,15 +1,32 @@
 from datetime import datetime
-from zoneinfo import ZoneInfo
 from typing import Optional, Dict, Any
 import uuid
 
 from pydantic import BaseModel, Field, ValidationError
-from dateutil import parser
+
+from app.tools.datetime_parser import parse_datetime
+from app.tools.timezone_resolver import UTC, resolve_timezone, suggest_timezone
 
 
 TOOL_NAME = "timezone_tool"
 
 
+def timezone_retry_reply(stored_state: Dict[str, Any], tz_result: Dict[str, Any], fallback: str) -> str:
+    """
+    The reply after an unresolved timezone: a "Did you mean" question
+    when the resolver has a close match (a "yes" then accepts it), else
+    `fallback`.
+    """
+
+    suggestion = tz_result.get("suggestion")
+
+    if not suggestion:
+        return fallback
+
+    stored_state["timezone_suggestion"] = suggestion
+    return f"I could not find that timezone. Did you mean {suggestion}? Reply yes, or enter your timezone again."
+
+
 class TimezoneNormalizeInput(BaseModel):
     datetime_str: str = Field(..., min_length=1)
     timezone_str: str = Field(..., min_length=1)
@@ -28,6 +45,7 @@ class TimezoneNormalizeOutput(BaseModel):
     success: bool
     utc_datetime: Optional[str] = None
     timezone: Optional[str] = None
+    suggestion: Optional[str] = None
     error: Optional[str] = None
     trace: ToolTrace
 
@@ -60,15 +78,16 @@ def timezone_normalize_tool(payload: Dict[str, Any]) -> Dict[str, Any]:
         ).model_dump()
 
     try:
-        try:
-            tz = ZoneInfo(data.timezone_str)
-        except Exception:
+        match = resolve_timezone(data.timezone_str)
+
+        if match is None:
             finished_at = datetime.utcnow().isoformat()
 
             return TimezoneNormalizeOutput(
                 success=False,
                 utc_datetime=None,
                 timezone=None,
+                suggestion=suggest_timezone(data.timezone_str),
                 error="invalid timezone",
                 trace=ToolTrace(
                     tool_name=TOOL_NAME,
@@ -80,10 +99,11 @@ def timezone_normalize_tool(payload: Dict[str, Any]) -> Dict[str, Any]:
                 )
             ).model_dump()
 
+        tz = match.tz
         clean_dt = data.datetime_str.strip()
 
         try:
-            parsed_dt = parser.parse(clean_dt)
+            parsed_dt = parse_datetime(clean_dt)
         except Exception:
             finished_at = datetime.utcnow().isoformat()
 
@@ -107,14 +127,14 @@ def timezone_normalize_tool(payload: Dict[str, Any]) -> Dict[str, Any]:
         else:
             local_dt = parsed_dt.replace(tzinfo=tz)
 
-        utc_dt = local_dt.astimezone(ZoneInfo("UTC"))
+        utc_dt = local_dt.astimezone(UTC)
 
         finished_at = datetime.utcnow().isoformat()
 
         return TimezoneNormalizeOutput(
             success=True,
             utc_datetime=utc_dt.replace(tzinfo=None).isoformat(),
-            timezone=data.timezone_str,
+            timezone=match.name,
             error=None,
             trace=ToolTrace(
                 tool_name=TOOL_NAME,
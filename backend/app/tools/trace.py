@@ -1,4 +1,4 @@
-from typing import Dict, Any
+from typing import Dict, Any, List
 from datetime import datetime
 
 def _ensure_trace_container(state: Dict[str, Any]) -> None:
@@ -56,3 +56,24 @@ def tool_trace(
             "output": tool_output,
         }
     )
+
+
+def transition_trace(
+    state: Dict[str, Any],
+    agent_name: str,
+    flow: Any,
+    from_field: Any,
+    to_field: Any,
+    path: List[str],
+) -> None:
+    add_trace(
+        state,
+        {
+            "type": "transition",
+            "name": agent_name,
+            "flow": flow,
+            "from": from_field,
+            "to": to_field,
+            "path": path,
+        }
+    )
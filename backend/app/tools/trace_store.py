@@ -0,0 +1,68 @@
+import json
+import os
+from typing import Dict, Any, List
+
+from app.db.session import SessionLocal
+from app.db.models import ToolTraceRecord
+
+
+# Only the ids of the most recent traces ride along in the conversation
+# state; the traces themselves live in the append-only tool_traces table.
+TRACE_RING_SIZE = int(os.getenv("TOOL_TRACE_RING_SIZE", "20"))
+
+
+def record_tool_trace(
+    data: Dict[str, Any],
+    conversation_id: str,
+    trace: Dict[str, Any]
+) -> None:
+
+    # States written before traces moved out of band still carry the
+    # full list; drop it so they shrink on their next save.
+    data.pop("tool_traces", None)
+
+    trace_id = trace.get("trace_id")
+
+    if conversation_id and trace_id:
+        db = SessionLocal()
+        try:
+            db.add(
+                ToolTraceRecord(
+                    conversation_id=conversation_id,
+                    trace_id=trace_id,
+                    tool_name=trace.get("tool_name"),
+                    status=trace.get("status"),
+                    trace_json=json.dumps(trace, default=str)
+                )
+            )
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            print("Trace store error:", str(e))
+        finally:
+            db.close()
+
+    if not trace_id:
+        return
+
+    ids = list(data.get("tool_trace_ids") or [])
+    ids.append(trace_id)
+    data["tool_trace_ids"] = ids[-TRACE_RING_SIZE:]
+
+
+def list_tool_traces(conversation_id: str, limit: int = 100) -> List[Dict[str, Any]]:
+
+    db = SessionLocal()
+    try:
+        rows = (
+            db.query(ToolTraceRecord)
+            .filter(ToolTraceRecord.conversation_id == conversation_id)
+            .order_by(ToolTraceRecord.id.desc())
+            .limit(limit)
+            .all()
+        )
+
+        return [json.loads(r.trace_json) for r in reversed(rows)]
+
+    finally:
+        db.close()
@@ -0,0 +1,155 @@
+"""
+Benchmark the whole /chat path offline against the Groq stand-in.
+
+Run from the backend directory:
+
+    python -m benchmarks.chat_bench [--conversations 20] [--concurrency 4]
+        [--mode replay] [--latency lognormal:-1.6,0.35] [--seed 7]
+        [--model-latency MODEL=SPEC ...] [--no-llm-only]
+
+The stand-in (benchmarks/groq_standin.py) is started on a free local
+port and the app is pointed at it through GROQ_BASE_URL, so the run uses
+no network and no Groq quota. The app's SQLite files are created in a
+temporary directory. Each conversation books one interview; the report
+is per-turn latency and overall throughput. One untimed warm-up booking
+seeds the database first.
+
+By default the intent agent's local classifier and intent cache are
+switched off (INTENT_LOCAL_ENABLED / INTENT_CACHE_ENABLED), since the
+scripted opening message would otherwise never reach the stand-in.
+--no-llm-only keeps them on, as in production.
+"""
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+import httpx
+import uvicorn
+
+from benchmarks.groq_standin import DEFAULT_CASSETTE, create_app, parse_model_latency
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _start_standin(port: int, mode: str, cassette: str, latency: str, seed: int, model_latency, slot_labels=None) -> uvicorn.Server:
+    config = uvicorn.Config(
+        create_app(mode, cassette, latency, seed, model_latency, slot_labels),
+        host="127.0.0.1",
+        port=port,
+        log_level="warning",
+    )
+    server = uvicorn.Server(config)
+    threading.Thread(target=server.run, daemon=True).start()
+
+    while not server.started:
+        time.sleep(0.01)
+
+    return server
+
+
+def _script(n: int):
+    return [
+        "I want to schedule an interview",
+        f"Bench User {n}",
+        f"bench.user{n}@example.com",
+        f"2027-{(n % 12) + 1:02d}-{(n % 27) + 1:02d} {9 + n % 8}:00",
+        "Asia/Kolkata",
+    ]
+
+
+async def _conversation(client: httpx.AsyncClient, n: int, latencies: list) -> None:
+    conversation_id = None
+
+    for message in _script(n):
+        started = time.perf_counter()
+        resp = await client.post("/chat", json={"user_message": message, "conversation_id": conversation_id})
+        latencies.append(time.perf_counter() - started)
+        resp.raise_for_status()
+        conversation_id = resp.json()["conversation_id"]
+
+
+async def _run(app, conversations: int, concurrency: int):
+    latencies: list = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(n: int) -> None:
+        async with semaphore:
+            await _conversation(client, n, latencies)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        # One untimed booking first, so the default interviewer row exists
+        # before concurrent first bookings race to create it.
+        await _conversation(client, conversations, [])
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one(n) for n in range(conversations)))
+        elapsed = time.perf_counter() - started
+
+        metrics = (await client.get("/metrics")).json()
+
+    return latencies, elapsed, metrics
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--conversations", type=int, default=20)
+    ap.add_argument("--concurrency", type=int, default=4)
+    ap.add_argument("--mode", default="replay", choices=("replay", "synthetic"))
+    ap.add_argument("--cassette", default=os.path.abspath(DEFAULT_CASSETTE))
+    ap.add_argument("--latency", default="lognormal:-1.6,0.35")
+    ap.add_argument("--seed", type=int, default=7)
+    ap.add_argument("--model-latency", action="append", default=[], metavar="MODEL=SPEC")
+    ap.add_argument("--llm-only", action=argparse.BooleanOptionalAction, default=True)
+    args = ap.parse_args()
+
+    port = _free_port()
+    server = _start_standin(port, args.mode, args.cassette, args.latency, args.seed, parse_model_latency(args.model_latency))
+
+    os.environ["GROQ_BASE_URL"] = f"http://127.0.0.1:{port}"
+    os.environ.setdefault("GROQ_API_KEY", "benchmark")
+
+    if args.llm_only:
+        os.environ["INTENT_LOCAL_ENABLED"] = "false"
+        os.environ["INTENT_CACHE_ENABLED"] = "false"
+
+    workdir = tempfile.mkdtemp(prefix="chat_bench_")
+    os.chdir(workdir)
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    from app.main import app
+
+    latencies, elapsed, metrics = asyncio.run(_run(app, args.conversations, args.concurrency))
+
+    standin = httpx.get(f"http://127.0.0.1:{port}/stats").json()
+    server.should_exit = True
+
+    latencies.sort()
+    p95 = latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))]
+
+    print(f"conversations: {args.conversations}  concurrency: {args.concurrency}  latency: {args.latency}  llm-only: {args.llm_only}")
+    print(f"turns: {len(latencies)}  elapsed: {elapsed:.2f}s  throughput: {len(latencies) / elapsed:.1f} turns/s")
+    print(f"LLM requests received by the stand-in (incl. warm-up): {standin['requests']}  cancelled by the app: {standin['cancelled']}")
+    print(f"turn latency ms  p50: {statistics.median(latencies) * 1000:.1f}  p95: {p95 * 1000:.1f}  max: {latencies[-1] * 1000:.1f}")
+
+    for model, stats in metrics["models"]["models"].items():
+        print(f"{model}: calls {stats['calls']}  p50 {stats['latency_p50_ms']} ms  tokens {stats['prompt_tokens']}+{stats['completion_tokens']}")
+
+    batching = metrics["intent"].get("batching")
+    if batching:
+        print(f"intent batch size: {batching['batch_size']}")
+        print(f"intent queue wait ms: {batching['queue_wait_ms']}")
+
+
+if __name__ == "__main__":
+    main()
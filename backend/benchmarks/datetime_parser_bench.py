@@ -0,0 +1,61 @@
+"""
+Throughput of the tiered datetime parser against plain dateutil.
+
+Run from the backend directory:
+
+    python -m benchmarks.datetime_parser_bench [--repeat 2000]
+
+"dateutil" is what timezone_normalize_tool used to call for every input.
+"tiered" is app.tools.datetime_parser: fromisoformat, then learned
+strptime formats, then dateutil. The parser starts cold, so the first
+pass over the corpus is where formats are learned. The script checks
+that both give identical results and prints the per-tier counters.
+"""
+import argparse
+import os
+import time
+
+from dateutil import parser as dateutil_parser
+
+from app.tools.datetime_parser import TieredDatetimeParser
+
+CORPUS = os.path.join(os.path.dirname(__file__), "data", "datetime_inputs.txt")
+
+
+def _throughput(fn, inputs, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in inputs:
+            fn(text)
+    return repeat * len(inputs) / (time.perf_counter() - start)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repeat", type=int, default=2000)
+    ap.add_argument("--corpus", default=CORPUS)
+    args = ap.parse_args()
+
+    with open(args.corpus, encoding="utf-8") as fh:
+        inputs = [line.strip() for line in fh if line.strip()]
+
+    tiered = TieredDatetimeParser()
+
+    mismatches = [t for t in inputs if tiered.parse(t) != dateutil_parser.parse(t)]
+
+    dateutil_rate = _throughput(dateutil_parser.parse, inputs, args.repeat)
+    tiered_rate = _throughput(tiered.parse, inputs, args.repeat)
+
+    print(f"inputs: {len(inputs)}  repeat: {args.repeat}")
+    print(f"dateutil  {dateutil_rate:10.0f} parses/s")
+    print(f"tiered    {tiered_rate:10.0f} parses/s  ({tiered_rate / dateutil_rate:.1f}x)")
+    print(f"mismatches: {len(mismatches)} {mismatches if mismatches else ''}")
+
+    stats = tiered.stats()
+    print(f"tiers: iso {stats['iso']}  learned {stats['learned']}  dateutil {stats['dateutil']}  failed {stats['failed']}")
+    for entry in stats["learned_formats"]:
+        print(f"  {entry['shape']:<14} {entry['format']:<22} {entry['hits']}")
+
+
+if __name__ == "__main__":
+    main()
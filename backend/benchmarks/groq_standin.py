@@ -0,0 +1,359 @@
+"""
+A local stand-in for the Groq chat completions API.
+
+Run from the backend directory:
+
+    python -m benchmarks.groq_standin [--port 8765] [--mode replay]
+        [--cassette benchmarks/data/groq_cassette.jsonl]
+        [--latency lognormal:-1.6,0.35] [--seed 7]
+        [--model-latency llama-3.1-8b-instant=fixed:0.05 ...]
+        [--slots benchmarks/data/booking_replay.jsonl]
+
+then point the backend at it:
+
+    GROQ_BASE_URL=http://127.0.0.1:8765 uvicorn app.main:app
+
+It serves POST /openai/v1/chat/completions (the path the groq SDK uses)
+in the OpenAI response format, streamed or not.
+
+Modes:
+
+  replay     answer from the cassette; requests it has not seen get a
+             synthetic answer (default)
+  record     forward to the real API (GROQ_UPSTREAM_URL, GROQ_API_KEY),
+             append each response to the cassette and return it
+  synthetic  never read the cassette
+
+Synthetic answers are deterministic: intent prompts (single or batched)
+are classified with LocalIntentClassifier, everything else gets a fixed
+reply. Structured intent prompts get null slots, unless --slots names a
+JSONL file of {"first": message, "llm_slots": {...}} cases (the
+booking_replay corpus format); a message found there gets its labelled
+slots. Cassette keys are a hash of the request body minus the stream
+flag, so a streamed and a plain call with the same prompt share one
+recording.
+
+--latency picks the simulated service time per request:
+
+  fixed:S  uniform:A,B  normal:MEAN,STD  lognormal:MU,SIGMA  (seconds)
+
+--model-latency MODEL=SPEC overrides it for one model, e.g. to give the
+small and large models different service times.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, Optional
+
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from starlette.requests import ClientDisconnect
+
+from app.tools.intent_classifier import LocalIntentClassifier
+
+DEFAULT_CASSETTE = os.path.join(os.path.dirname(__file__), "data", "groq_cassette.jsonl")
+UPSTREAM_URL = os.getenv("GROQ_UPSTREAM_URL", "https://api.groq.com")
+
+SYNTHETIC_REPLY = "I can help you schedule, reschedule or cancel interviews. May I know your full name?"
+
+
+def parse_latency(spec: str, seed: Optional[int] = None) -> Callable[[], float]:
+    """Turn "kind:a,b" into a function returning one delay in seconds."""
+
+    rng = random.Random(seed)
+    kind, _, args = (spec or "fixed:0").partition(":")
+    values = [float(v) for v in args.split(",") if v.strip()] or [0.0]
+
+    if kind == "fixed":
+        return lambda: values[0]
+
+    if kind == "uniform":
+        return lambda: rng.uniform(values[0], values[1])
+
+    if kind == "normal":
+        return lambda: max(0.0, rng.gauss(values[0], values[1]))
+
+    if kind == "lognormal":
+        return lambda: rng.lognormvariate(values[0], values[1])
+
+    raise ValueError(f"unknown latency distribution: {kind}")
+
+
+def parse_model_latency(items) -> Dict[str, str]:
+    """["model=spec", ...] from the command line into a dict."""
+    return dict(item.split("=", 1) for item in items or [])
+
+
+def request_key(body: Dict[str, Any]) -> str:
+    keyed = {k: v for k, v in body.items() if k not in ("stream", "stream_options")}
+    raw = json.dumps(keyed, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class Cassette:
+    """Append-only JSONL recording of request/response pairs."""
+
+    def __init__(self, path: Optional[str]):
+        self.path = path
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as fh:
+                for line in fh:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._entries[entry["key"]] = entry["response"]
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._entries.get(key)
+
+    def put(self, key: str, request: Dict[str, Any], response: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = response
+            if self.path:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                with open(self.path, "a", encoding="utf-8") as fh:
+                    fh.write(json.dumps({"key": key, "request": request, "response": response}) + "\n")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+def _completion(model: str, content: str, prompt_tokens: int = 0) -> Dict[str, Any]:
+    completion_tokens = len(content.split())
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex[:24]}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }
+        ],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        },
+    }
+
+
+class SyntheticResponder:
+    """Deterministic answers for requests the cassette does not cover."""
+
+    def __init__(self, slot_labels: Optional[Dict[str, Dict[str, Any]]] = None):
+        self.classifier = LocalIntentClassifier()
+        self.slot_labels = slot_labels or {}
+
+    def _classify(self, user_message: str) -> Dict[str, Any]:
+        local = self.classifier.classify(user_message) or {"intent": "inquiry", "confidence": 0.7}
+        return {
+            "intent": local["intent"],
+            "confidence": round(max(local["confidence"], 0.7), 2),
+        }
+
+    def respond(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        messages = body.get("messages") or []
+        prompt = messages[-1].get("content", "") if messages else ""
+        model = body.get("model", "synthetic")
+        # Rough word-count "tokens"; enough for accounting to have numbers.
+        prompt_tokens = sum(len(str(m.get("content", "")).split()) for m in messages)
+
+        if "Classify the intent of each numbered user message" in prompt:
+            lines = prompt.rsplit("User messages:\n", 1)[-1].splitlines()
+            results = []
+            for line in lines:
+                number, _, quoted = line.partition(". ")
+                if not number.isdigit():
+                    continue
+                results.append(dict(self._classify(json.loads(quoted)), index=int(number)))
+            return _completion(model, json.dumps({"results": results}), prompt_tokens)
+
+        if "Classify the user's intent" not in prompt:
+            return _completion(model, SYNTHETIC_REPLY, prompt_tokens)
+
+        user_message = prompt.rsplit("User message:\n", 1)[-1]
+        answer = self._classify(user_message)
+
+        if "\"slots\"" in prompt:
+            answer["slots"] = {
+                "candidate_name": None,
+                "candidate_email": None,
+                "preferred_datetime": None,
+                "timezone": None,
+                **self.slot_labels.get(user_message.strip(), {}),
+            }
+
+        return _completion(model, json.dumps(answer), prompt_tokens)
+
+
+def load_slot_labels(path: Optional[str]) -> Dict[str, Dict[str, Any]]:
+    """Opening message -> labelled slots, from a booking_replay-style corpus."""
+
+    labels: Dict[str, Dict[str, Any]] = {}
+
+    if path:
+        with open(path, encoding="utf-8") as fh:
+            for line in fh:
+                if line.strip():
+                    case = json.loads(line)
+                    labels[case["first"].strip()] = case.get("llm_slots") or {}
+
+    return labels
+
+
+def _stream_chunks(response: Dict[str, Any]):
+    """Re-emit a recorded completion as OpenAI-style SSE chunks."""
+
+    content = response["choices"][0]["message"]["content"] or ""
+    base = {
+        "id": response.get("id", f"chatcmpl-{uuid.uuid4().hex[:24]}"),
+        "object": "chat.completion.chunk",
+        "created": response.get("created", int(time.time())),
+        "model": response.get("model", "synthetic"),
+    }
+
+    words = content.split(" ")
+    for i, word in enumerate(words):
+        piece = word if i == 0 else " " + word
+        chunk = dict(base, choices=[{"index": 0, "delta": {"content": piece}, "finish_reason": None}])
+        yield f"data: {json.dumps(chunk)}\n\n"
+
+    chunk = dict(base, choices=[{"index": 0, "delta": {}, "finish_reason": "stop"}])
+    # Like Groq, report usage on the last chunk.
+    if response.get("usage"):
+        chunk["x_groq"] = {"id": base["id"], "usage": response["usage"]}
+    yield f"data: {json.dumps(chunk)}\n\n"
+    yield "data: [DONE]\n\n"
+
+
+def create_app(
+    mode: str = "replay",
+    cassette_path: Optional[str] = DEFAULT_CASSETTE,
+    latency: str = "fixed:0",
+    seed: Optional[int] = None,
+    model_latency: Optional[Dict[str, str]] = None,
+    slot_labels: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> FastAPI:
+
+    if mode not in ("replay", "record", "synthetic"):
+        raise ValueError(f"unknown mode: {mode}")
+
+    app = FastAPI(title="Groq stand-in")
+    cassette = Cassette(cassette_path if mode != "synthetic" else None)
+    synthetic = SyntheticResponder(slot_labels)
+    default_delay = parse_latency(latency, seed)
+    model_delays = {
+        model: parse_latency(spec, seed)
+        for model, spec in (model_latency or {}).items()
+    }
+
+    def delay(model: str) -> float:
+        return model_delays.get(model, default_delay)()
+
+    # "requests" counts everything received, including calls the app
+    # abandoned; those are also counted as "cancelled".
+    stats = {"requests": 0, "cancelled": 0, "replayed": 0, "recorded": 0, "synthetic": 0}
+
+    async def upstream(body: Dict[str, Any]) -> Dict[str, Any]:
+        plain = dict(body)
+        plain.pop("stream", None)
+        plain.pop("stream_options", None)
+        async with httpx.AsyncClient(base_url=UPSTREAM_URL, timeout=60) as client:
+            resp = await client.post(
+                "/openai/v1/chat/completions",
+                json=plain,
+                headers={"Authorization": f"Bearer {os.getenv('GROQ_API_KEY', '')}"},
+            )
+            resp.raise_for_status()
+            return resp.json()
+
+    @app.post("/openai/v1/chat/completions")
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        stats["requests"] += 1
+
+        try:
+            body = await request.json()
+        except ClientDisconnect:
+            stats["cancelled"] += 1
+            return Response(status_code=499)
+
+        key = request_key(body)
+
+        response = cassette.get(key) if mode != "synthetic" else None
+
+        if response is not None:
+            stats["replayed"] += 1
+            await asyncio.sleep(delay(body.get("model", "")))
+        elif mode == "record":
+            response = await upstream(body)
+            cassette.put(key, body, response)
+            stats["recorded"] += 1
+        else:
+            response = synthetic.respond(body)
+            stats["synthetic"] += 1
+            await asyncio.sleep(delay(body.get("model", "")))
+
+        if await request.is_disconnected():
+            stats["cancelled"] += 1
+            return Response(status_code=499)
+
+        if body.get("stream"):
+            return StreamingResponse(_stream_chunks(response), media_type="text/event-stream")
+
+        return JSONResponse(response)
+
+    @app.get("/openai/v1/models")
+    @app.get("/v1/models")
+    async def list_models():
+        # Used by the app's connection warm-up.
+        return {"object": "list", "data": [{"id": "synthetic", "object": "model", "owned_by": "standin"}]}
+
+    @app.get("/stats")
+    async def get_stats():
+        return dict(stats, mode=mode, cassette_entries=len(cassette))
+
+    return app
+
+
+def main() -> None:
+    import uvicorn
+
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--mode", default="replay", choices=("replay", "record", "synthetic"))
+    ap.add_argument("--cassette", default=DEFAULT_CASSETTE)
+    ap.add_argument("--latency", default="fixed:0")
+    ap.add_argument("--seed", type=int, default=None)
+    ap.add_argument("--model-latency", action="append", default=[], metavar="MODEL=SPEC")
+    ap.add_argument("--slots", default=None, metavar="CORPUS")
+    args = ap.parse_args()
+
+    app = create_app(
+        args.mode,
+        args.cassette,
+        args.latency,
+        args.seed,
+        parse_model_latency(args.model_latency),
+        load_slot_labels(args.slots),
+    )
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
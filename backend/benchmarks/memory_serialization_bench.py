@@ -0,0 +1,172 @@
+"""
+Compare conversation_memory write formats over a simulated conversation.
+
+Run from the backend directory:
+
+    python -m benchmarks.memory_serialization_bench [--turns 40] [--repeat 200]
+
+"baseline" is the old json.dumps/json.loads path, "compact" is
+memory_codec.encode_state/decode_state, and "delta" is what save_state
+sends in MEMORY_WRITE_MODE=delta: a merge patch while the state is below
+the compression threshold and the patch is smaller than the full text,
+otherwise a full compact write. List values such as tool_traces are
+replaced whole by a merge patch.
+
+For "delta", encode is the whole write-side cost in save_state (the
+compact text, make_patch and encode_patch), and decode is applying what
+was sent: json_patch on the previous row in an in-memory SQLite
+database, as SQLiteMemoryBackend does, or decode_state for a full write.
+"""
+import argparse
+import copy
+import json
+import sqlite3
+import time
+import uuid
+
+from app.tools.memory_codec import (
+    decode_state,
+    encode_patch,
+    encode_state,
+    make_patch,
+)
+
+
+def _simulated_turns(turns: int):
+    state = {}
+
+    for turn in range(turns):
+        state = copy.deepcopy(state)
+
+        if turn == 0:
+            state["intent"] = "schedule"
+            state["awaiting_field"] = "candidate_name"
+        elif turn == 1:
+            state["candidate_name"] = "Asha Verma"
+            state["awaiting_field"] = "candidate_email"
+        elif turn == 2:
+            state["candidate_email"] = "asha.verma@example.com"
+            state["awaiting_field"] = "preferred_datetime"
+        else:
+            state["intent"] = ("schedule", "reschedule", "cancel")[turn % 3]
+            state["awaiting_field"] = ("interview_choice", "new_preferred_datetime", "new_timezone")[turn % 3]
+            state["pending_interviews"] = [
+                {
+                    "id": i,
+                    "scheduled_time": f"2026-03-{(i % 28) + 1:02d}T05:30:00",
+                    "interviewer": "Default Interviewer"
+                }
+                for i in range(1, 2 + turn // 4)
+            ]
+            state.setdefault("tool_traces", []).append(
+                {
+                    "tool_name": "calendar_update_tool",
+                    "trace_id": str(uuid.uuid4()),
+                    "started_at": "2026-02-01T10:00:00.000000",
+                    "finished_at": "2026-02-01T10:00:00.120000",
+                    "status": "success",
+                    "input": {"interview_id": turn, "new_time_utc": "2026-03-01T05:30:00"}
+                }
+            )
+
+        yield state
+
+
+def _delta_payload(previous, state):
+    """What save_state sends: a merge patch when it is smaller, else the full text."""
+
+    payload = encode_state(state)
+
+    if previous is None or not isinstance(payload, str):
+        return payload, False
+
+    changes = make_patch(previous, state)
+    if changes is None:
+        return payload, False
+
+    patch = encode_patch(changes)
+    if len(patch) >= len(payload):
+        return payload, False
+
+    return patch, True
+
+
+def _time(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--turns", type=int, default=40)
+    ap.add_argument("--repeat", type=int, default=200)
+    args = ap.parse_args()
+
+    totals = {
+        "baseline_bytes": 0,
+        "compact_bytes": 0,
+        "delta_bytes": 0,
+        "baseline_encode": 0.0,
+        "baseline_decode": 0.0,
+        "compact_encode": 0.0,
+        "compact_decode": 0.0,
+        "delta_encode": 0.0,
+        "delta_decode": 0.0,
+    }
+
+    db = sqlite3.connect(":memory:")
+    previous = None
+    previous_row = None
+
+    for state in _simulated_turns(args.turns):
+        baseline = json.dumps(state)
+        compact = encode_state(state)
+
+        totals["baseline_bytes"] += len(baseline.encode("utf-8"))
+        totals["compact_bytes"] += len(compact if isinstance(compact, bytes) else compact.encode("utf-8"))
+
+        sent, is_patch = _delta_payload(previous, state)
+
+        totals["delta_bytes"] += len(sent if isinstance(sent, bytes) else sent.encode("utf-8"))
+
+        totals["baseline_encode"] += _time(lambda: json.dumps(state), args.repeat)
+        totals["baseline_decode"] += _time(lambda: json.loads(baseline), args.repeat)
+        totals["compact_encode"] += _time(lambda: encode_state(state), args.repeat)
+        totals["compact_decode"] += _time(lambda: decode_state(compact), args.repeat)
+        totals["delta_encode"] += _time(lambda: _delta_payload(previous, state), args.repeat)
+
+        if is_patch:
+            apply = lambda: db.execute("SELECT json_patch(?, ?)", (previous_row, sent)).fetchone()
+            totals["delta_decode"] += _time(apply, args.repeat)
+            previous_row = apply()[0]
+        else:
+            totals["delta_decode"] += _time(lambda: decode_state(sent), args.repeat)
+            previous_row = sent
+
+        previous = state
+
+    turns = args.turns
+
+    print(f"turns: {turns}")
+    print(f"{'format':<10}{'bytes/turn':>12}{'encode us':>12}{'decode us':>12}")
+    print(
+        f"{'baseline':<10}{totals['baseline_bytes'] / turns:>12.0f}"
+        f"{totals['baseline_encode'] / turns * 1e6:>12.1f}"
+        f"{totals['baseline_decode'] / turns * 1e6:>12.1f}"
+    )
+    print(
+        f"{'compact':<10}{totals['compact_bytes'] / turns:>12.0f}"
+        f"{totals['compact_encode'] / turns * 1e6:>12.1f}"
+        f"{totals['compact_decode'] / turns * 1e6:>12.1f}"
+    )
+    print(
+        f"{'delta':<10}{totals['delta_bytes'] / turns:>12.0f}"
+        f"{totals['delta_encode'] / turns * 1e6:>12.1f}"
+        f"{totals['delta_decode'] / turns * 1e6:>12.1f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
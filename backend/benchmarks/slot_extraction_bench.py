@@ -0,0 +1,103 @@
+"""
+Per-message cost of slot extraction: the old inline regex chain versus
+app.tools.slot_extractor.
+
+Run from the backend directory:
+
+    python -m benchmarks.slot_extraction_bench [--repeat 2000]
+
+"legacy" reproduces what ConversationAgent used to run on a turn:
+extract_fields with inline pattern strings, the acknowledgement,
+negation and interview-listing checks, and the datetime cleaning.
+"engine" is one extract_slots call, which covers all of it. The script
+also counts the messages where the two disagree on the booking fields.
+"""
+import argparse
+import os
+import re
+import time
+
+from app.tools.slot_extractor import extract_slots
+
+CORPUS = os.path.join(os.path.dirname(__file__), "data", "slot_messages.txt")
+
+
+def _legacy_clean(dt: str) -> str:
+    dt = re.sub(r'\bIST\b', '', dt, flags=re.IGNORECASE)
+    dt = re.sub(r'\b[A-Za-z]+\/[A-Za-z_]+\b', '', dt)
+    dt = re.sub(r'^\s*(on|at)\s+', '', dt, flags=re.IGNORECASE)
+    return dt.strip()
+
+
+def legacy(user_message: str):
+    user_message = (user_message or "").strip()
+    fields = {}
+
+    re.fullmatch(r"(ok|okay|no|yes|hmm|thanks|thank you)", user_message, re.I)
+    re.search(
+        r"\b(no|nah|nope|not now|not really|don't want|do not want|dont want|stop|leave it|later|cancel it|forget it|never mind|nevermind|nothing|nothing else|no thanks|not interested)\b",
+        user_message,
+        re.I
+    )
+    re.search(r"\b(interview|interviews|my interviews|list)\b", user_message, re.I)
+
+    m = re.search(r'[\w\.-]+@[\w\.-]+\.\w+', user_message)
+    if m and re.fullmatch(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}", m.group().strip()):
+        fields["candidate_email"] = m.group().strip()
+
+    m = re.search(
+        r"(?:\bmy name is\b|\bi am\b|\bi'm\b|\bthis is\b|\bmyself\b|\bname is\b|\bcall me\b|\bit is\b|\bim\b)\s+([A-Za-z]+(?:\s+[A-Za-z]+){0,3})",
+        user_message,
+        re.IGNORECASE
+    )
+    if m:
+        fields["candidate_name"] = m.group(1).strip()
+
+    tz = re.search(r'\b[A-Za-z]+\/[A-Za-z_]+|\bIST\b', user_message)
+    if tz:
+        val = tz.group().strip()
+        if val.upper() == "IST":
+            val = "Asia/Kolkata"
+        fields["timezone"] = val
+
+    parts = [p.strip() for p in user_message.split(",")]
+    if len(parts) >= 2:
+        dt = _legacy_clean(parts[-1])
+        if dt:
+            fields["preferred_datetime"] = dt
+
+    return fields
+
+
+def _per_message_us(fn, messages, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for message in messages:
+            fn(message)
+    return (time.perf_counter() - start) / (repeat * len(messages)) * 1e6
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repeat", type=int, default=2000)
+    ap.add_argument("--corpus", default=CORPUS)
+    args = ap.parse_args()
+
+    with open(args.corpus, encoding="utf-8") as fh:
+        messages = [line.rstrip("\n") for line in fh if line.strip()]
+
+    mismatches = [m for m in messages if legacy(m) != extract_slots(m).fields()]
+
+    legacy_us = _per_message_us(legacy, messages, args.repeat)
+    engine_us = _per_message_us(extract_slots, messages, args.repeat)
+
+    print(f"messages: {len(messages)}  repeat: {args.repeat}")
+    print(f"legacy  {legacy_us:8.2f} us/message")
+    print(f"engine  {engine_us:8.2f} us/message")
+    print(f"field mismatches: {len(mismatches)}")
+    for message in mismatches:
+        print(f"  {message!r}: legacy={legacy(message)} engine={extract_slots(message).fields()}")
+
+
+if __name__ == "__main__":
+    main()
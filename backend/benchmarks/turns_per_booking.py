@@ -0,0 +1,140 @@
+"""
+Replay booking conversations through /chat and count the turns each one
+needs.
+
+Run from the backend directory:
+
+    python -m benchmarks.turns_per_booking [--corpus benchmarks/data/booking_replay.jsonl]
+
+Every case in the corpus has the user's opening message, the answer they
+give to each question the assistant asks, and the slots the structured
+intent call (INTENT_EXTRACTION_MODE=true) should return for the opening
+message. The Groq stand-in (benchmarks/groq_standin.py, synthetic mode)
+answers with those labelled slots, so the run is offline. Everything else
+is the real pipeline: intent_node with its local classifier, slot-cue gate
+and awaited-field shortcut, ConversationAgent, and the availability and
+scheduling agents against a fresh SQLite database.
+
+"before" runs with INTENT_EXTRACTION_MODE=false and "after" with true,
+each in its own process and temporary directory. A turn is one POST
+/chat. A booking is done when a turn reaches SchedulingAgent, which
+creates the interview. Without Mailtrap credentials the notifications
+fail, which does not change the count. The corpus times fall inside
+AvailabilityAgent's working hours on distinct days, so no case is turned
+away for the slot itself.
+
+The labels are what a model that extracts perfectly would return, so
+"after" still assumes the model is right; the pipeline around it is not
+simulated.
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import httpx
+
+from benchmarks.chat_bench import _free_port, _start_standin
+from benchmarks.groq_standin import load_slot_labels
+
+MAX_TURNS = 12
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+async def _replay(client: httpx.AsyncClient, case: dict) -> int:
+    conversation_id = None
+    message = case["first"]
+
+    for turn in range(1, MAX_TURNS + 1):
+        resp = await client.post("/chat", json={"user_message": message, "conversation_id": conversation_id})
+        resp.raise_for_status()
+        body = resp.json()
+        conversation_id = body["conversation_id"]
+
+        agents = {entry.get("name") for entry in body.get("trace") or [] if entry.get("type") == "agent"}
+        if "SchedulingAgent" in agents:
+            return turn
+
+        awaiting = (body.get("conversation_state") or {}).get("awaiting_field")
+        if awaiting not in case["answers"]:
+            break
+
+        message = case["answers"][awaiting]
+
+    return MAX_TURNS
+
+
+async def _replay_all(app, cases: list) -> list:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        return [await _replay(client, case) for case in cases]
+
+
+def _column(corpus: str, cases: list) -> dict:
+    """Replay every case in this process; INTENT_EXTRACTION_MODE comes from the environment."""
+
+    port = _free_port()
+    server = _start_standin(port, "synthetic", None, "fixed:0", None, {}, load_slot_labels(corpus))
+
+    os.environ["GROQ_BASE_URL"] = f"http://127.0.0.1:{port}"
+    os.environ.setdefault("GROQ_API_KEY", "benchmark")
+    os.environ["LLM_WARM_ON_STARTUP"] = "false"
+
+    os.chdir(tempfile.mkdtemp(prefix="turns_per_booking_"))
+    sys.path.insert(0, BACKEND_DIR)
+
+    from app.main import app
+
+    turns = asyncio.run(_replay_all(app, cases))
+    standin = httpx.get(f"http://127.0.0.1:{port}/stats").json()
+    server.should_exit = True
+
+    return {"turns": turns, "llm_requests": standin["requests"]}
+
+
+def _run_column(corpus: str, extraction: bool) -> dict:
+    env = dict(os.environ, INTENT_EXTRACTION_MODE="true" if extraction else "false")
+    out = subprocess.run(
+        [sys.executable, "-m", "benchmarks.turns_per_booking", "--corpus", corpus, "--column"],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # The app prints its own errors to stdout; the result is the last line.
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--corpus", default=os.path.join(os.path.dirname(__file__), "data", "booking_replay.jsonl"))
+    ap.add_argument("--column", action="store_true", help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    corpus = os.path.abspath(args.corpus)
+
+    with open(corpus, encoding="utf-8") as fh:
+        cases = [json.loads(line) for line in fh if line.strip()]
+
+    if args.column:
+        print(json.dumps(_column(corpus, cases)))
+        return
+
+    before = _run_column(corpus, extraction=False)
+    after = _run_column(corpus, extraction=True)
+
+    print(f"cases: {len(cases)}")
+    print(f"{'#':<4}{'before':>8}{'after':>8}  first message")
+    for i, (case, b, a) in enumerate(zip(cases, before["turns"], after["turns"]), 1):
+        print(f"{i:<4}{b:>8}{a:>8}  {case['first'][:60]}")
+    print(f"{'mean':<4}{sum(before['turns']) / len(cases):>8.2f}{sum(after['turns']) / len(cases):>8.2f}")
+    print(f"LLM requests (stand-in): before {before['llm_requests']}  after {after['llm_requests']}")
+
+
+if __name__ == "__main__":
+    main()